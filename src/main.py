@@ -1,11 +1,14 @@
 import flet as ft
 import flet_permission_handler as fph
+from storage.home_snapshot import COLD_START_KEY
 from themes.catppuccin_theme import catppuccin_theme
-from views.home_view import home_view
-from views.vehicle_view import vehicle_view
-from views.event_view import event_view
+from views.router import build_view
+from sync.client import SyncClient
+from sync.versions import REMOTE_CHANGE_KEY, get_sync_url, get_tracker
+from tracing.recorder import get_trace_dir, start_recording, trace_event
 
 def main(page: ft.Page):
+    page.session.set(COLD_START_KEY, True)
     page.theme = catppuccin_theme("light")
     page.dark_theme = catppuccin_theme("dark")
 
@@ -40,26 +43,53 @@ def main(page: ft.Page):
     )
 
     def route_change(e: ft.RouteChangeEvent):
+        trace_event(page, "route", route=page.route)
         page.views.clear()
-        if page.route == "/":
-            page.views.append(home_view(page))
-        elif page.route.startswith("/vehicle/"):
-            parts = page.route.split("/vehicle/")[1].split("/")
-            license_plate = parts[0]
-            if len(parts) == 1:
-                page.views.append(vehicle_view(page, license_plate))
-            else:
-                event_type = parts[1]
-                page.views.append(event_view(page, license_plate, event_type))
+        page.session.set(REMOTE_CHANGE_KEY, None)
+        view = build_view(page, page.route)
+        # Only the first view of the session may paint from the snapshot.
+        page.session.set(COLD_START_KEY, False)
+        if view is not None:
+            page.views.append(view)
         page.update()
 
     def view_pop(e: ft.ViewPopEvent):
+        trace_event(page, "pop")
         page.views.pop()
         page.go(page.views[-1].route)
 
     page.on_route_change = route_change
     page.on_view_pop = view_pop
 
+    on_close_handlers = []
+
+    trace_dir = get_trace_dir(page)
+    if trace_dir:
+        on_close_handlers.append(start_recording(page, trace_dir).close)
+
+    def on_remote_change(changes):
+        # The view on screen patches the records that changed; rebuilding it
+        # would drop open dialogs, selections and unsaved date picks.
+        handler = page.session.get(REMOTE_CHANGE_KEY)
+        if handler is not None:
+            handler(changes)
+
+    sync_url = get_sync_url(page)
+    if sync_url:
+        def start_sync():
+            # Loading the tracker reads every store; keep it off the first paint.
+            sync_client = SyncClient(get_tracker(page), sync_url, on_change=on_remote_change)
+            on_close_handlers.append(sync_client.stop)
+            sync_client.start()
+
+        page.run_thread(start_sync)
+
+    def on_close(e: ft.ControlEvent):
+        for handler in on_close_handlers:
+            handler()
+
+    page.on_close = on_close
+
     if page.client_storage.get("first_launch") is None:
         page.open(permission_dialog)
     else:
@@ -0,0 +1,87 @@
+import calendar
+from datetime import datetime
+from typing import Dict, Iterable, Tuple
+import flet as ft
+from storage.urgency import get_summaries
+from storage.vehicle_registry import get_registry
+from sync.protocol import event_key
+from sync.versions import get_tracker
+
+# Bulk edits over the stores. Each one is a single pass over the events and
+# one write per storage key, however many vehicles or events it covers.
+
+EventRef = Tuple[str, str]  # (vehicle id, event label)
+
+RENEW_MONTHS = (1, 3, 6, 12)
+
+
+def add_months(iso: str, months: int) -> str:
+    # Same day of month, clamped to its last day (31 Jan + 1 month = 28/29 Feb).
+    when = datetime.fromisoformat(iso)
+    month = when.month - 1 + months
+    year = when.year + month // 12
+    month = month % 12 + 1
+    day = min(when.day, calendar.monthrange(year, month)[1])
+    renewed = when.replace(year=year, month=month, day=day)
+    # Keep the stored format: date-only values stay date-only.
+    return renewed.isoformat() if len(iso) > 10 else renewed.date().isoformat()
+
+
+def delete_vehicles(page: ft.Page, vehicle_ids: Iterable[str]) -> None:
+    ids = set(vehicle_ids)
+    tracker = get_tracker(page)
+    registry = get_registry(page)
+    summaries = get_summaries(page)
+    with tracker.lock:
+        kept, removed = [], []
+        for evt in page.client_storage.get("events") or []:
+            (removed if evt.get("vehicle_id") in ids else kept).append(evt)
+        page.client_storage.set("events", kept)
+        for vehicle_id in ids:
+            summaries.remove_vehicle(vehicle_id)
+        summaries.save(page)
+        registry.remove_many(ids)
+        registry.save(page)
+        tracker.touch_all(
+            {"vehicles": ids, "events": [event_key(e["vehicle_id"], e["label"]) for e in removed]},
+            deleted=True,
+        )
+
+
+def delete_events(page: ft.Page, refs: Iterable[EventRef]) -> None:
+    refs = set(refs)
+    tracker = get_tracker(page)
+    summaries = get_summaries(page)
+    with tracker.lock:
+        evts = page.client_storage.get("events") or []
+        page.client_storage.set("events", [e for e in evts if (e.get("vehicle_id"), e.get("label")) not in refs])
+        for vehicle_id, label in refs:
+            summaries.remove_event(vehicle_id, label)
+        summaries.save(page)
+        tracker.touch("events", [event_key(vehicle_id, label) for vehicle_id, label in refs], deleted=True)
+
+
+def renew_events(page: ft.Page, refs: Iterable[EventRef], months: int) -> Dict[EventRef, str]:
+    # Pushes each existing expiration date forward; refs without an event
+    # (e.g. a vehicle that has no ROVINIETA) are skipped. Returns the renewed
+    # ones with their new expiration dates.
+    refs = set(refs)
+    tracker = get_tracker(page)
+    summaries = get_summaries(page)
+    with tracker.lock:
+        evts = page.client_storage.get("events") or []
+        renewed: Dict[EventRef, str] = {}
+        for evt in evts:
+            ref = (evt.get("vehicle_id"), evt.get("label"))
+            if ref in refs:
+                evt["expiration_date"] = add_months(evt["expiration_date"], months)
+                renewed[ref] = evt["expiration_date"]
+        if not renewed:
+            return renewed
+        page.client_storage.set("events", evts)
+        for (vehicle_id, label), expiration_date in renewed.items():
+            summaries.set_event(vehicle_id, label, expiration_date)
+        summaries.save(page)
+        tracker.touch("events", [event_key(vehicle_id, label) for vehicle_id, label in renewed])
+    return renewed
+
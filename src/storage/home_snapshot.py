@@ -0,0 +1,57 @@
+from datetime import date
+from typing import Any, Dict, List, Optional
+import flet as ft
+from storage.urgency import UrgencySummaries
+from storage.vehicle_registry import VehicleRegistry
+
+SNAPSHOT_KEY = "home_snapshot"
+# Set by main before any background work starts and cleared once the first
+# view is built: only that view, if it is home, paints from the snapshot.
+COLD_START_KEY = "home_cold_start"
+
+# A row is {"id", "plate", "summary", "tone"}; tone is "error", "tertiary"
+# or None and maps to a color scheme entry when rendered.
+Row = Dict[str, Optional[str]]
+
+
+def snapshot_row(registry: VehicleRegistry, summaries: UrgencySummaries, vehicle_id: str, today: date) -> Row:
+    urgency = summaries.urgency(vehicle_id, today)
+    parts = []
+    if urgency.expired:
+        parts.append(f"{urgency.expired} expired")
+    if urgency.soon:
+        parts.append(f"{urgency.soon} expiring soon")
+    if urgency.nearest_date is not None:
+        parts.append(f"next: {urgency.nearest_label} {urgency.nearest_date.strftime('%d/%m/%Y')}")
+
+    tone = None
+    if urgency.expired:
+        tone = "error"
+    elif urgency.soon:
+        tone = "tertiary"
+
+    return {
+        "id": vehicle_id,
+        "plate": registry.plate(vehicle_id),
+        "summary": " · ".join(parts) or None,
+        "tone": tone,
+    }
+
+
+def snapshot_rows(registry: VehicleRegistry, summaries: UrgencySummaries, today: date) -> List[Row]:
+    return [snapshot_row(registry, summaries, vehicle_id, today) for vehicle_id in registry.order]
+
+
+def load_snapshot(page: ft.Page) -> Optional[List[Row]]:
+    rows: Any = page.client_storage.get(SNAPSHOT_KEY)
+    if not isinstance(rows, list) or not all(isinstance(r, dict) and "id" in r and "plate" in r for r in rows):
+        return None
+    page.session.set(SNAPSHOT_KEY, rows)
+    return rows
+
+
+def save_snapshot(page: ft.Page, rows: List[Row]) -> None:
+    # Skip the write when the home screen did not change since the last one.
+    if page.session.get(SNAPSHOT_KEY) != rows:
+        page.client_storage.set(SNAPSHOT_KEY, rows)
+        page.session.set(SNAPSHOT_KEY, rows)
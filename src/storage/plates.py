@@ -0,0 +1,34 @@
+import re
+from typing import Optional
+
+COUNTIES = (
+    "AB", "AG", "AR", "BC", "BH", "BN", "BR", "BT", "BV", "BZ", "CJ", "CL",
+    "CS", "CT", "CV", "DB", "DJ", "GJ", "GL", "GR", "HD", "HR", "IF", "IL",
+    "IS", "MH", "MM", "MS", "NT", "OT", "PH", "SB", "SJ", "SM", "SV", "TL",
+    "TM", "TR", "VL", "VN", "VS",
+)
+
+_SEPARATORS = re.compile(r"[\s\-.·_]+")
+# Bucharest: B 12 ABC or B 123 ABC; counties: CJ 12 ABC.
+_STANDARD = re.compile(r"^(B)(\d{2,3})([A-Z]{3})$|^(" + "|".join(COUNTIES) + r")(\d{2})([A-Z]{3})$")
+# Temporary (red) plates: county followed by 3 to 6 digits, e.g. B 012345.
+_TEMPORARY = re.compile(r"^(B|" + "|".join(COUNTIES) + r")(\d{3,6})$")
+
+
+def canonical_key(plate: str) -> str:
+    # "B 123 ABC", "B123ABC" and "b-123-abc" all share the key "B123ABC".
+    return _SEPARATORS.sub("", plate).upper()
+
+
+def normalize_plate(plate: str) -> Optional[str]:
+    key = canonical_key(plate)
+    match = _STANDARD.match(key)
+    if match:
+        groups = [g for g in match.groups() if g]
+        if groups[1].strip("0") == "" or groups[2][0] in "IO" or "Q" in groups[2]:
+            return None
+        return " ".join(groups)
+    match = _TEMPORARY.match(key)
+    if match:
+        return " ".join(match.groups())
+    return None
@@ -0,0 +1,23 @@
+import threading
+import flet as ft
+
+SESSION_LOCK_KEY = "load_lock"
+TRACKER_LOCK_KEY = "tracker_lock"
+
+_create_lock = threading.Lock()
+
+
+def session_lock(page: ft.Page, key: str = SESSION_LOCK_KEY) -> threading.RLock:
+    # Guards loading the session-cached stores. It is per session, so a
+    # session waiting on its browser's client storage never holds up
+    # another one; the module lock only covers creating it. The change
+    # tracker has a lock of its own (TRACKER_LOCK_KEY): it is slow to load
+    # and the home screen must not wait on it for the registry.
+    lock = page.session.get(key)
+    if lock is None:
+        with _create_lock:
+            lock = page.session.get(key)
+            if lock is None:
+                lock = threading.RLock()
+                page.session.set(key, lock)
+    return lock
@@ -0,0 +1,78 @@
+from datetime import date, datetime
+from typing import Any, Dict, List, NamedTuple, Optional
+import flet as ft
+from storage.session import session_lock
+
+SUMMARY_KEY = "urgency_summaries"
+SOON_DAYS = 15
+
+
+class Urgency(NamedTuple):
+    expired: int
+    soon: int
+    nearest_label: Optional[str]
+    nearest_date: Optional[date]
+
+
+class UrgencySummaries:
+    def __init__(self, data: Optional[Dict[str, Dict[str, str]]] = None):
+        # vehicle id -> {event label: expiration date}. A vehicle has at most
+        # one event per type, so each entry stays a handful of dates and the
+        # counts relative to today are cheap to derive when rendering.
+        self.data: Dict[str, Dict[str, str]] = data or {}
+
+    @staticmethod
+    def is_valid(data: Any) -> bool:
+        return isinstance(data, dict) and all(isinstance(v, dict) for v in data.values())
+
+    @classmethod
+    def from_events(cls, events: List[Dict]) -> "UrgencySummaries":
+        summaries = cls()
+        for evt in events:
+            if isinstance(evt, dict) and evt.get("vehicle_id") and evt.get("expiration_date"):
+                summaries.set_event(evt["vehicle_id"], evt["label"], evt["expiration_date"])
+        return summaries
+
+    def save(self, page: ft.Page) -> None:
+        page.client_storage.set(SUMMARY_KEY, self.data)
+
+    def set_event(self, vehicle_id: str, label: str, expiration_date: str) -> None:
+        self.data.setdefault(vehicle_id, {})[label] = expiration_date
+
+    def remove_event(self, vehicle_id: str, label: str) -> None:
+        dates = self.data.get(vehicle_id)
+        if dates is not None:
+            dates.pop(label, None)
+
+    def remove_vehicle(self, vehicle_id: str) -> None:
+        self.data.pop(vehicle_id, None)
+
+    def urgency(self, vehicle_id: str, today: date) -> Urgency:
+        expired = soon = 0
+        nearest_label, nearest_date = None, None
+        for label, iso in self.data.get(vehicle_id, {}).items():
+            expiration = datetime.fromisoformat(iso).date()
+            days = (expiration - today).days
+            if days < 0:
+                expired += 1
+                continue
+            if days <= SOON_DAYS:
+                soon += 1
+            if nearest_date is None or expiration < nearest_date:
+                nearest_label, nearest_date = label, expiration
+        return Urgency(expired, soon, nearest_label, nearest_date)
+
+
+def get_summaries(page: ft.Page) -> UrgencySummaries:
+    with session_lock(page):
+        summaries = page.session.get(SUMMARY_KEY)
+        if summaries is None:
+            data = page.client_storage.get(SUMMARY_KEY)
+            if UrgencySummaries.is_valid(data):
+                summaries = UrgencySummaries(data)
+            else:
+                # First run (or a damaged value): build once from the events.
+                summaries = UrgencySummaries.from_events(page.client_storage.get("events") or [])
+                summaries.save(page)
+            page.session.set(SUMMARY_KEY, summaries)
+        return summaries
@@ -0,0 +1,144 @@
+import uuid
+from typing import Any, Dict, List, Optional, Set
+import flet as ft
+from storage.session import session_lock
+from storage.plates import canonical_key, normalize_plate
+
+REGISTRY_KEY = "vehicle_registry"
+LEGACY_VEHICLES_KEY = "vehicles"
+
+
+def new_vehicle_id() -> str:
+    return uuid.uuid4().hex
+
+
+class VehicleRegistry:
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        data = data or {}
+        # Display order, vehicle metadata by stable id, and the hash index of
+        # canonical plate keys, persisted together as one storage value.
+        self.order: List[str] = data.get("order", [])
+        self.vehicles: Dict[str, Dict[str, Any]] = data.get("vehicles", {})
+        self.index: Dict[str, str] = data.get("index", {})
+
+    @staticmethod
+    def is_valid(data: Any) -> bool:
+        if not isinstance(data, dict):
+            return False
+        order, vehicles, index = data.get("order"), data.get("vehicles"), data.get("index")
+        if not (isinstance(order, list) and isinstance(vehicles, dict) and isinstance(index, dict)):
+            return False
+        return len(order) == len(vehicles) and all(isinstance(vehicles.get(i), dict) for i in order)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"order": self.order, "vehicles": self.vehicles, "index": self.index}
+
+    def save(self, page: ft.Page) -> None:
+        page.client_storage.set(REGISTRY_KEY, self.to_dict())
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __contains__(self, vehicle_id: str) -> bool:
+        return vehicle_id in self.vehicles
+
+    def plate(self, vehicle_id: str) -> Optional[str]:
+        vehicle = self.vehicles.get(vehicle_id)
+        return vehicle["plate"] if vehicle else None
+
+    def find(self, plate: str) -> Optional[str]:
+        return self.index.get(canonical_key(plate))
+
+    def add(self, plate: str, vehicle_id: Optional[str] = None) -> str:
+        vehicle_id = vehicle_id or new_vehicle_id()
+        self.put(vehicle_id, plate)
+        return vehicle_id
+
+    def rename(self, vehicle_id: str, plate: str) -> None:
+        old_key = canonical_key(self.vehicles[vehicle_id]["plate"])
+        if self.index.get(old_key) == vehicle_id:
+            del self.index[old_key]
+        self.vehicles[vehicle_id]["plate"] = plate
+        self.index[canonical_key(plate)] = vehicle_id
+
+    def put(self, vehicle_id: str, plate: str) -> Optional[str]:
+        # Two devices may add (or rename to) the same plate before syncing.
+        # The smaller id keeps the plate on every device; the other one is
+        # returned so the caller can fold it into the winner.
+        key = canonical_key(plate)
+        existing = self.index.get(key)
+        if vehicle_id in self.vehicles:
+            self.rename(vehicle_id, plate)
+        else:
+            self.order.append(vehicle_id)
+            self.vehicles[vehicle_id] = {"plate": plate}
+            self.index[key] = vehicle_id
+        if existing is None or existing == vehicle_id:
+            return None
+        self.index[key] = min(existing, vehicle_id)
+        return max(existing, vehicle_id)
+
+    def remove(self, vehicle_id: str) -> None:
+        self.remove_many({vehicle_id})
+
+    def remove_many(self, vehicle_ids: Set[str]) -> None:
+        # Single pass over the order and, only when an indexed plate lost
+        # its owner, a single pass to find the remaining duplicates.
+        orphaned = set()
+        for vehicle_id in vehicle_ids:
+            vehicle = self.vehicles.pop(vehicle_id, None)
+            if vehicle is None:
+                continue
+            key = canonical_key(vehicle["plate"])
+            if self.index.get(key) == vehicle_id:
+                del self.index[key]
+                orphaned.add(key)
+        self.order = [vehicle_id for vehicle_id in self.order if vehicle_id not in vehicle_ids]
+        if orphaned:
+            for other_id, other in self.vehicles.items():
+                key = canonical_key(other["plate"])
+                if key in orphaned:
+                    self.index[key] = min(self.index.get(key, other_id), other_id)
+
+
+def migrate_legacy(page: ft.Page) -> VehicleRegistry:
+    # Older versions kept raw plate strings under "vehicles" and joined
+    # events to them by plate; move both over to vehicle ids.
+    registry = VehicleRegistry()
+    for plate in page.client_storage.get(LEGACY_VEHICLES_KEY) or []:
+        if isinstance(plate, str) and plate.strip() and registry.find(plate) is None:
+            registry.add(normalize_plate(plate) or plate.strip().upper())
+
+    events: Dict[str, Dict] = {}
+    for evt in page.client_storage.get("events") or []:
+        if not isinstance(evt, dict) or "vehicle" not in evt:
+            continue
+        vehicle_id = registry.find(evt["vehicle"])
+        if vehicle_id is None:
+            continue
+        migrated = {"vehicle_id": vehicle_id, "label": evt.get("label"), "expiration_date": evt.get("expiration_date")}
+        # Plates that only differed in spelling collapse into one vehicle;
+        # keep the later expiration date for each of its events.
+        key = f"{vehicle_id}/{migrated['label']}"
+        if key not in events or (migrated["expiration_date"] or "") > (events[key]["expiration_date"] or ""):
+            events[key] = migrated
+
+    registry.save(page)
+    page.client_storage.set("events", list(events.values()))
+    page.client_storage.remove(LEGACY_VEHICLES_KEY)
+    # Sync versions were keyed by plate; the tracker re-stamps everything.
+    page.client_storage.remove("sync_state")
+    return registry
+
+
+def get_registry(page: ft.Page) -> VehicleRegistry:
+    with session_lock(page):
+        registry = page.session.get(REGISTRY_KEY)
+        if registry is None:
+            data = page.client_storage.get(REGISTRY_KEY)
+            if data is None and page.client_storage.get(LEGACY_VEHICLES_KEY) is not None:
+                registry = migrate_legacy(page)
+            else:
+                registry = VehicleRegistry(data if VehicleRegistry.is_valid(data) else None)
+            page.session.set(REGISTRY_KEY, registry)
+        return registry
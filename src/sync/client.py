@@ -0,0 +1,96 @@
+import threading
+import urllib.request
+from typing import Callable, Dict, List, Optional
+from sync.protocol import Change, chunk, decode_batch, encode_batch
+from sync.versions import ChangeTracker
+
+
+class SyncClient:
+    def __init__(
+        self,
+        tracker: ChangeTracker,
+        url: str,
+        on_change: Callable[[List[Change]], None],
+        interval: float = 30,
+        timeout: float = 15,
+    ):
+        self.tracker = tracker
+        self.url = url
+        self.on_change = on_change
+        self.interval = interval
+        self.timeout = timeout
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        tracker.listeners.append(self.notify)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="masinica-sync", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wake.set()
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    def _run(self) -> None:
+        delay = self.interval
+        while not self._stopped.is_set():
+            try:
+                merged = self.sync_once()
+                if merged:
+                    self.on_change(merged)
+                delay = self.interval
+            except Exception:
+                # Offline, the server is unhappy or sent something we can't
+                # read: keep local edits pending and retry later, backing off
+                # up to ten intervals. The thread must outlive any of these.
+                delay = min(delay * 2, self.interval * 10)
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def _post(self, payload: Dict) -> Dict:
+        request = urllib.request.Request(
+            f"{self.url}/sync",
+            data=encode_batch(payload),
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            body = decode_batch(response.read())
+        if not (
+            isinstance(body, dict)
+            and isinstance(body.get("seq"), int)
+            and isinstance(body.get("changes"), list)
+            and (body.get("epoch") is None or isinstance(body["epoch"], str))
+        ):
+            raise ValueError("Malformed sync response")
+        return body
+
+    def sync_once(self) -> List[Change]:
+        # Returns the remote changes merged into the local stores.
+        merged: List[Change] = []
+        state = self.tracker.state
+        batches = chunk(self.tracker.pending())
+        while batches:
+            batch = batches.pop(0)
+            response = self._post({
+                "device": self.tracker.device,
+                "since": state["watermark"],
+                "changes": batch,
+            })
+            if state["epoch"] is not None and response["epoch"] != state["epoch"]:
+                # The server was reset; push everything we have and start over.
+                self.tracker.resync()
+                batches = chunk(self.tracker.pending())
+                continue
+            merged += self.tracker.merge(response["changes"])
+            if batch:
+                self.tracker.mark_pushed(batch)
+            self.tracker.mark_pulled(response["seq"], response["epoch"])
+            if response.get("more") and not batches:
+                batches.append([])
+        return merged
@@ -0,0 +1,53 @@
+import gzip
+import json
+from typing import Any, Dict, List, Optional
+
+STORES = ("vehicles", "events")
+BATCH_SIZE = 500
+
+# A change is {"store", "key", "version", "device", "deleted", "data"}.
+Change = Dict[str, Any]
+
+
+def event_key(vehicle: str, label: str) -> str:
+    return f"{vehicle}/{label}"
+
+
+def wins(candidate: Change, current: Optional[Change]) -> bool:
+    # Last writer wins on the Lamport version, ties broken by device id,
+    # so every peer and the server pick the same record.
+    if current is None:
+        return True
+    return (candidate["version"], candidate["device"]) > (current["version"], current["device"])
+
+
+def valid_change(change: Any) -> bool:
+    # A change from the wire, checked before anything is applied: a live
+    # record must carry data that matches its key.
+    if not isinstance(change, dict) or change.get("store") not in STORES:
+        return False
+    if not isinstance(change.get("key"), str) or not isinstance(change.get("device"), str):
+        return False
+    if not isinstance(change.get("version"), int) or not isinstance(change.get("deleted"), bool):
+        return False
+    data = change.get("data")
+    if change["deleted"] or data is None:
+        return True
+    if not isinstance(data, dict):
+        return False
+    if change["store"] == "vehicles":
+        return isinstance(data.get("plate"), str)
+    fields = [data.get(field) for field in ("vehicle_id", "label", "expiration_date")]
+    return all(isinstance(f, str) for f in fields) and event_key(fields[0], fields[1]) == change["key"]
+
+
+def encode_batch(payload: Dict[str, Any]) -> bytes:
+    return gzip.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_batch(body: bytes) -> Dict[str, Any]:
+    return json.loads(gzip.decompress(body).decode("utf-8"))
+
+
+def chunk(changes: List[Change], size: int = BATCH_SIZE) -> List[List[Change]]:
+    return [changes[i:i + size] for i in range(0, len(changes), size)] or [[]]
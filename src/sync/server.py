@@ -0,0 +1,105 @@
+import argparse
+import json
+import os
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from sync.protocol import BATCH_SIZE, Change, decode_batch, encode_batch, wins
+
+
+class SyncStore:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.lock = threading.Lock()
+        self.epoch = uuid.uuid4().hex
+        self.seq = 0
+        # Latest change per record, kept in ascending seq order so a pull
+        # only walks the records changed since the client's watermark.
+        self.log: Dict[str, Change] = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                saved = json.load(f)
+            self.epoch = saved["epoch"]
+            self.seq = saved["seq"]
+            self.log = {f"{c['store']}:{c['key']}": c for c in saved["changes"]}
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"epoch": self.epoch, "seq": self.seq, "changes": list(self.log.values())}, f)
+        os.replace(tmp, self.path)
+
+    def exchange(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with self.lock:
+            accepted = set()
+            for change in payload.get("changes", []):
+                record_id = f"{change['store']}:{change['key']}"
+                if not wins(change, self.log.get(record_id)):
+                    continue
+                self.seq += 1
+                self.log.pop(record_id, None)
+                self.log[record_id] = {**change, "seq": self.seq}
+                accepted.add(self.seq)
+            if accepted:
+                self._save()
+
+            since = payload.get("since", 0)
+            if since > self.seq:
+                since = 0
+            delta: List[Change] = []
+            for change in reversed(self.log.values()):
+                if change["seq"] <= since:
+                    break
+                if change["seq"] not in accepted:
+                    delta.append(change)
+            delta.reverse()
+            more = len(delta) > BATCH_SIZE
+            delta = delta[:BATCH_SIZE]
+            return {
+                "epoch": self.epoch,
+                "seq": delta[-1]["seq"] if more else self.seq,
+                "changes": delta,
+                "more": more,
+            }
+
+
+def make_handler(store: SyncStore) -> type:
+    class SyncHandler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            if self.path != "/sync":
+                self.send_error(404)
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = decode_batch(self.rfile.read(length))
+            except (OSError, ValueError):
+                self.send_error(400)
+                return
+            body = encode_batch(store.exchange(payload))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return SyncHandler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reference sync server for Mașinică.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--data", default="sync_server.json", help="file the server persists its records to")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(SyncStore(args.data)))
+    print(f"Sync server listening on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
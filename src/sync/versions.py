@@ -0,0 +1,355 @@
+import os
+import threading
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+import flet as ft
+from storage.session import TRACKER_LOCK_KEY, session_lock
+from storage.urgency import get_summaries
+from storage.vehicle_registry import get_registry
+from sync.protocol import STORES, Change, event_key, valid_change, wins
+
+STATE_KEY = "sync_state"
+# Session key of the handler the view on screen registers to patch itself
+# after a sync pulled remote changes.
+REMOTE_CHANGE_KEY = "on_remote_change"
+OFFLINE_KEY = "sync_offline"
+QUARANTINE_KEY = "events_quarantine"
+SYNC_URL_ENV = "MASINICA_SYNC_URL"
+SYNC_URL_KEY = "sync_server_url"
+EVENT_FIELDS = ("vehicle_id", "label", "expiration_date")
+
+
+def get_sync_url(page: ft.Page) -> Optional[str]:
+    url = os.environ.get(SYNC_URL_ENV) or page.client_storage.get(SYNC_URL_KEY)
+    return url.rstrip("/") if url else None
+
+
+class ChangeTracker:
+    def __init__(self, page: ft.Page, enabled: bool = True):
+        self.page = page
+        self.enabled = enabled
+        self.lock = threading.RLock()
+        self.listeners: List[Callable[[], None]] = []
+        self.state: Optional[Dict] = None
+        # Records changed locally and not yet accepted by the server.
+        self.dirty: Dict[str, Set[str]] = {store: set() for store in STORES}
+        self._offline: Optional[Dict[str, Dict[str, bool]]] = None
+        self._offline_loaded = False
+        if not enabled:
+            # Sync is off: no versions are kept and no store is read here.
+            return
+        self.registry = get_registry(page)
+        self.summaries = get_summaries(page)
+        state = page.client_storage.get(STATE_KEY)
+        rebuilt = not self._valid_state(state)
+        if rebuilt:
+            self.state = self._rebuilt_state(state)
+        else:
+            self.state = state
+            self._load_dirty()
+        offline = self._apply_offline()
+        if rebuilt or offline:
+            self._save()
+        if offline:
+            page.client_storage.remove(OFFLINE_KEY)
+
+    # --- storage helpers ---
+    def _load_events(self) -> Dict[str, Dict]:
+        # Events by record key. Records that can't be keyed (a missing field,
+        # a duplicate) are moved to a quarantine key rather than dropped.
+        events: Dict[str, Dict] = {}
+        bad = []
+        stored = self.page.client_storage.get("events")
+        for evt in stored if isinstance(stored, list) else ([] if stored is None else [stored]):
+            if not isinstance(evt, dict) or any(evt.get(field) is None for field in EVENT_FIELDS):
+                bad.append(evt)
+                continue
+            key = event_key(evt["vehicle_id"], evt["label"])
+            if key in events:
+                bad.append(evt)
+            else:
+                events[key] = evt
+        if bad:
+            quarantined = self.page.client_storage.get(QUARANTINE_KEY)
+            self.page.client_storage.set(QUARANTINE_KEY, (quarantined if isinstance(quarantined, list) else []) + bad)
+            self.page.client_storage.set("events", list(events.values()))
+        return events
+
+    @staticmethod
+    def _valid_state(state: Any) -> bool:
+        if not isinstance(state, dict):
+            return False
+        if not isinstance(state.get("device"), str):
+            return False
+        if not all(isinstance(state.get(k), int) for k in ("clock", "watermark")):
+            return False
+        versions = state.get("versions")
+        return isinstance(versions, dict) and all(isinstance(versions.get(s), dict) for s in STORES)
+
+    def _load_dirty(self) -> None:
+        dirty = self.state.get("dirty")
+        if isinstance(dirty, dict):
+            self.dirty = {store: set(dirty.get(store) or ()) for store in STORES}
+            return
+        # Written before the dirty set existed: everything newer than the
+        # last pushed version is still pending.
+        pushed = self.state.pop("pushed", 0)
+        self.dirty = {
+            store: {key for key, version in self.state["versions"][store].items() if version[0] > pushed}
+            for store in STORES
+        }
+
+    def _rebuilt_state(self, previous: Any) -> Dict:
+        # First time sync is on, or the saved state was damaged: stamp the
+        # local records as they are and let the next sync push them and
+        # re-pull everything. Only the version table is rebuilt; the stores
+        # are never reset (unkeyable events are quarantined, not dropped).
+        device = previous.get("device") if isinstance(previous, dict) else None
+        if not isinstance(device, str):
+            device = uuid.uuid4().hex
+        versions = {
+            "vehicles": {vehicle_id: [1, device, False] for vehicle_id in self.registry.order},
+            "events": {key: [1, device, False] for key in self._load_events()},
+        }
+        self.dirty = {store: set(versions[store]) for store in STORES}
+        return {"device": device, "clock": 1, "watermark": 0, "epoch": None, "versions": versions}
+
+    def _apply_offline(self) -> bool:
+        # Records changed while sync was off get a fresh version now.
+        offline = self.page.client_storage.get(OFFLINE_KEY)
+        if not isinstance(offline, dict):
+            return False
+        self.state["clock"] += 1
+        for store, keys in offline.items():
+            if store in STORES and isinstance(keys, dict):
+                for key, deleted in keys.items():
+                    self.state["versions"][store][key] = [self.state["clock"], self.device, bool(deleted)]
+                    self.dirty[store].add(key)
+        return True
+
+    def _save(self) -> None:
+        self.state["dirty"] = {store: sorted(keys) for store, keys in self.dirty.items()}
+        self.page.client_storage.set(STATE_KEY, self.state)
+
+    # --- local changes ---
+    @property
+    def device(self) -> str:
+        return self.state["device"]
+
+    def touch(self, store: str, keys: Iterable[str], deleted: bool = False) -> None:
+        self.touch_all({store: keys}, deleted)
+
+    def touch_all(self, touched: Dict[str, Iterable[str]], deleted: bool = False) -> None:
+        # One clock tick and one state write for any number of records.
+        if not self.enabled:
+            self._touch_offline(touched, deleted)
+            return
+        with self.lock:
+            self.state["clock"] += 1
+            version = [self.state["clock"], self.device, deleted]
+            for store, keys in touched.items():
+                table = self.state["versions"][store]
+                for key in keys:
+                    table[key] = list(version)
+                    self.dirty[store].add(key)
+            self._save()
+        for listener in self.listeners:
+            listener()
+
+    def _touch_offline(self, touched: Dict[str, Iterable[str]], deleted: bool) -> None:
+        # Sync is off. Only if it was used before (and may be turned back
+        # on) remember which records changed, in a key of their own.
+        with self.lock:
+            if not self._offline_loaded:
+                self._offline_loaded = True
+                if self.page.client_storage.contains_key(STATE_KEY):
+                    self._offline = self.page.client_storage.get(OFFLINE_KEY) or {}
+            if self._offline is None:
+                return
+            for store, keys in touched.items():
+                table = self._offline.setdefault(store, {})
+                for key in keys:
+                    table[key] = deleted
+            self.page.client_storage.set(OFFLINE_KEY, self._offline)
+
+    def resync(self) -> None:
+        # Full resync (e.g. the server lost its data): keep our versions but
+        # re-push every record and re-pull everything from the start.
+        with self.lock:
+            self.dirty = {store: set(self.state["versions"][store]) for store in STORES}
+            self.state["watermark"] = 0
+            self.state["epoch"] = None
+            self._save()
+
+    # --- sync exchange ---
+    def pending(self) -> List[Change]:
+        with self.lock:
+            events = None
+            changes = []
+            for store in STORES:
+                table = self.state["versions"][store]
+                for key in self.dirty[store]:
+                    if key not in table:
+                        continue
+                    version, device, deleted = table[key]
+                    data = None
+                    if not deleted and store == "vehicles":
+                        data = {"plate": self.registry.plate(key)} if key in self.registry else None
+                    elif not deleted:
+                        if events is None:
+                            events = self._load_events()
+                        data = events.get(key)
+                    changes.append({
+                        "store": store,
+                        "key": key,
+                        "version": version,
+                        "device": device,
+                        "deleted": deleted,
+                        "data": data,
+                    })
+            changes.sort(key=lambda c: c["version"])
+            return changes
+
+    def mark_pushed(self, changes: List[Change]) -> None:
+        with self.lock:
+            for change in changes:
+                table = self.state["versions"][change["store"]]
+                current = table.get(change["key"])
+                if current is None or current[0] != change["version"]:
+                    # Changed again since (locally or by a merge).
+                    continue
+                self.dirty[change["store"]].discard(change["key"])
+                if current[2] and change["store"] == "events":
+                    # The server keeps the tombstone and only ever hands out
+                    # its latest record per key, so ours is no longer needed.
+                    # Vehicle tombstones stay: merge refuses live events for
+                    # a vehicle that is known to be deleted.
+                    del table[change["key"]]
+            self._save()
+
+    def mark_pulled(self, watermark: int, epoch: Optional[str]) -> None:
+        with self.lock:
+            self.state["watermark"] = watermark
+            self.state["epoch"] = epoch
+            self._save()
+
+    def merge(self, changes: List[Change]) -> List[Change]:
+        # Applies the remote changes that win and returns them. Malformed
+        # ones are skipped before the version table is touched, so a bad
+        # record can never be marked as applied without its data.
+        with self.lock:
+            winners = []
+            for change in filter(valid_change, changes):
+                table = self.state["versions"][change["store"]]
+                current = table.get(change["key"])
+                if current is not None:
+                    current = {"version": current[0], "device": current[1]}
+                if wins(change, current):
+                    winners.append(change)
+                    table[change["key"]] = [change["version"], change["device"], change["deleted"]]
+                    # The server already has this version; don't push it back.
+                    self.dirty[change["store"]].discard(change["key"])
+                    self.state["clock"] = max(self.state["clock"], change["version"])
+            if not winners:
+                return []
+
+            events = self._load_events()
+            duplicates = []
+            orphans: Dict[str, None] = {}
+            for change in winners:
+                key = change["key"]
+                if change["store"] == "vehicles":
+                    if change["deleted"] or change["data"] is None:
+                        # Its events go with it, as in bulk.delete_vehicles.
+                        self.registry.remove(key)
+                        self.summaries.remove_vehicle(key)
+                        orphans.update(dict.fromkeys(k for k in events if k.startswith(f"{key}/")))
+                    else:
+                        loser = self.registry.put(key, change["data"]["plate"])
+                        if loser is not None:
+                            duplicates.append(loser)
+                elif change["deleted"] or change["data"] is None:
+                    events.pop(key, None)
+                    self.summaries.remove_event(*key.split("/", 1))
+                elif self._deleted_vehicle(change["data"]["vehicle_id"]):
+                    # Edited on a device that hadn't seen the vehicle go yet.
+                    orphans[key] = None
+                else:
+                    evt = events[key] = change["data"]
+                    self.summaries.set_event(evt["vehicle_id"], evt["label"], evt["expiration_date"])
+            local = self._drop_orphans(list(orphans), events) + self._fold_duplicates(duplicates, events)
+
+            self.registry.save(self.page)
+            self.page.client_storage.set("events", list(events.values()))
+            self.summaries.save(self.page)
+            self._save()
+        if local:
+            # Push our own changes right away instead of on the next interval.
+            for listener in self.listeners:
+                listener()
+        return winners + local
+
+    def _deleted_vehicle(self, vehicle_id: str) -> bool:
+        version = self.state["versions"]["vehicles"].get(vehicle_id)
+        return version is not None and version[2]
+
+    def _stamp(self, store: str, key: str, deleted: bool, data: Optional[Dict]) -> Change:
+        # A local change made by merge itself, at the current clock.
+        self.state["versions"][store][key] = [self.state["clock"], self.device, deleted]
+        self.dirty[store].add(key)
+        return {
+            "store": store,
+            "key": key,
+            "version": self.state["clock"],
+            "device": self.device,
+            "deleted": deleted,
+            "data": data,
+        }
+
+    def _drop_orphans(self, keys: List[str], events: Dict[str, Dict]) -> List[Change]:
+        # Events of a deleted vehicle: drop them and tombstone them, so every
+        # device and the server end up without them.
+        if not keys:
+            return []
+        self.state["clock"] += 1
+        for key in keys:
+            events.pop(key, None)
+        return [self._stamp("events", key, True, None) for key in keys]
+
+    def _fold_duplicates(self, losers: List[str], events: Dict[str, Dict]) -> List[Change]:
+        # Each loser shares its plate with a vehicle that kept it: move its
+        # events over (the later expiration date wins when both have one),
+        # then tombstone it. Returns the local changes this made.
+        if not losers:
+            return []
+        self.state["clock"] += 1
+        folded: List[Change] = []
+
+        for loser in losers:
+            if loser not in self.registry:
+                continue
+            winner = self.registry.find(self.registry.plate(loser))
+            prefix = f"{loser}/"
+            for key in [key for key in events if key.startswith(prefix)]:
+                evt = events.pop(key)
+                self.summaries.remove_event(loser, evt["label"])
+                folded.append(self._stamp("events", key, True, None))
+                target = event_key(winner, evt["label"])
+                kept = events.get(target)
+                if kept is None or evt["expiration_date"] > kept["expiration_date"]:
+                    moved = events[target] = {**evt, "vehicle_id": winner}
+                    self.summaries.set_event(winner, evt["label"], evt["expiration_date"])
+                    folded.append(self._stamp("events", target, False, moved))
+            self.summaries.remove_vehicle(loser)
+            self.registry.remove(loser)
+            folded.append(self._stamp("vehicles", loser, True, None))
+        return folded
+
+
+def get_tracker(page: ft.Page) -> ChangeTracker:
+    with session_lock(page, TRACKER_LOCK_KEY):
+        tracker = page.session.get(STATE_KEY)
+        if tracker is None:
+            tracker = ChangeTracker(page, enabled=get_sync_url(page) is not None)
+            page.session.set(STATE_KEY, tracker)
+        return tracker
@@ -1,6 +1,25 @@
+from functools import lru_cache
+from typing import NamedTuple
 import flet as ft
 from themes.palettes.catppuccin import latte, mocha
 
+
+class CatppuccinStyles(NamedTuple):
+    colors: ft.ColorScheme
+    helper_text: ft.TextStyle
+
+    # Buttons write their own color, bgcolor, side, shape and padding into
+    # the style they are given, so each button gets a fresh one.
+    def danger_button(self) -> ft.ButtonStyle:
+        return ft.ButtonStyle(color=self.colors.error)
+
+    def error_button(self) -> ft.ButtonStyle:
+        return ft.ButtonStyle(color=self.colors.on_error, icon_color=self.colors.on_error, bgcolor=self.colors.error)
+
+
+# Themes and the text styles derived from them are never mutated, so every
+# session shares the same objects instead of building its own.
+@lru_cache(maxsize=None)
 def catppuccin_theme(theme_mode: str) -> ft.Theme:
     flavor = mocha if theme_mode == "dark" else latte
     primary_color = flavor["mauve"]
@@ -56,3 +75,22 @@ def catppuccin_theme(theme_mode: str) -> ft.Theme:
             bgcolor=secondary_color,
         ),
     )
+
+
+def _build_styles(theme: ft.Theme) -> CatppuccinStyles:
+    colors = theme.color_scheme
+    return CatppuccinStyles(colors=colors, helper_text=ft.TextStyle(color=colors.on_background))
+
+
+@lru_cache(maxsize=None)
+def catppuccin_styles(theme_mode: str) -> CatppuccinStyles:
+    return _build_styles(catppuccin_theme(theme_mode))
+
+
+def theme_styles(theme: ft.Theme) -> CatppuccinStyles:
+    # Shared only for the cached themes, which live as long as the process;
+    # any other theme gets styles of its own.
+    for theme_mode in ("light", "dark"):
+        if theme is catppuccin_theme(theme_mode):
+            return catppuccin_styles(theme_mode)
+    return _build_styles(theme)
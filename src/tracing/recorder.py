@@ -0,0 +1,86 @@
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import flet as ft
+from storage.vehicle_registry import get_registry
+
+TRACE_DIR_ENV = "MASINICA_TRACE"
+TRACE_DIR_KEY = "trace_dir"
+RECORDER_KEY = "trace_recorder"
+TRACE_VERSION = 1
+
+# Storage keys captured at the start of a trace so a replay starts from the
+# same data the user had.
+SNAPSHOT_KEYS = ("vehicle_registry", "events", "urgency_summaries", "home_snapshot")
+
+# A step is [milliseconds since the trace started, kind, args].
+Step = Tuple[int, str, Dict[str, Any]]
+
+
+class TraceRecorder:
+    def __init__(self, path: str, storage: Dict[str, Any]):
+        self.path = path
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.file = gzip.open(path, "wt", encoding="utf-8")
+        self._write({
+            "version": TRACE_VERSION,
+            "started": datetime.now().isoformat(timespec="seconds"),
+            "storage": storage,
+        })
+
+    def _write(self, item: Any) -> None:
+        with self.lock:
+            if self.file.closed:
+                return
+            self.file.write(json.dumps(item, separators=(",", ":")) + "\n")
+            self.file.flush()
+
+    def record(self, kind: str, **args: Any) -> None:
+        elapsed = int((time.monotonic() - self.started) * 1000)
+        self._write([elapsed, kind, args])
+
+    def close(self) -> None:
+        with self.lock:
+            self.file.close()
+
+
+def get_trace_dir(page: ft.Page) -> Optional[str]:
+    return os.environ.get(TRACE_DIR_ENV) or page.client_storage.get(TRACE_DIR_KEY)
+
+
+def start_recording(page: ft.Page, trace_dir: str) -> TraceRecorder:
+    os.makedirs(trace_dir, exist_ok=True)
+    path = os.path.join(trace_dir, f"trace-{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl.gz")
+    get_registry(page)  # migrate legacy data before taking the snapshot
+    storage = {key: page.client_storage.get(key) for key in SNAPSHOT_KEYS}
+    recorder = TraceRecorder(path, storage)
+    page.session.set(RECORDER_KEY, recorder)
+    return recorder
+
+
+def trace_event(page: ft.Page, kind: str, **args: Any) -> None:
+    recorder = page.session.get(RECORDER_KEY)
+    if recorder is not None:
+        recorder.record(kind, **args)
+
+
+def read_trace(path: str) -> Tuple[Dict[str, Any], List[Step]]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("version") != TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version: {header.get('version')}")
+        steps = []
+        try:
+            for line in f:
+                if line.strip():
+                    steps.append(tuple(json.loads(line)))
+        except EOFError:
+            # The app was killed before the recorder was closed; every
+            # flushed step is still readable.
+            pass
+    return header, steps
@@ -0,0 +1,335 @@
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import flet as ft
+from storage.home_snapshot import COLD_START_KEY
+from storage.vehicle_registry import get_registry
+from themes.catppuccin_theme import catppuccin_theme
+from sync.versions import REMOTE_CHANGE_KEY
+from tracing.recorder import Step, read_trace
+from views.router import build_view
+
+
+class FakeStorage:
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        # Values are kept as JSON, like the real client storage, so every
+        # get hands out a fresh copy.
+        self.data = {k: json.dumps(v) for k, v in (data or {}).items() if v is not None}
+        self.gets = 0
+        self.sets = 0
+
+    def get(self, key: str) -> Any:
+        self.gets += 1
+        value = self.data.get(key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, value: Any) -> bool:
+        self.sets += 1
+        self.data[key] = json.dumps(value)
+        return True
+
+    def contains_key(self, key: str) -> bool:
+        self.gets += 1
+        return key in self.data
+
+    def remove(self, key: str) -> bool:
+        self.sets += 1
+        return self.data.pop(key, None) is not None
+
+
+class FakeSession:
+    def __init__(self):
+        self.data: Dict[str, Any] = {}
+
+    def get(self, key: str) -> Any:
+        return self.data.get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        self.data[key] = value
+
+    def contains_key(self, key: str) -> bool:
+        return key in self.data
+
+    def remove(self, key: str) -> None:
+        self.data.pop(key, None)
+
+
+class FakePage:
+    def __init__(self, storage: Dict[str, Any], width: float = 400):
+        self.title = ""
+        self.route = "/"
+        self.views: List[ft.View] = []
+        self.dialogs: List[ft.Control] = []
+        self.width = width
+        self.theme = catppuccin_theme("light")
+        self.dark_theme = catppuccin_theme("dark")
+        self.client_storage = FakeStorage(storage)
+        self.session = FakeSession()
+        self.session.set(COLD_START_KEY, True)  # as main does
+        self.updates = 0
+        self.on_resize = None
+
+    def update(self, *controls: ft.Control) -> None:
+        self.updates += 1
+
+    def run_thread(self, handler: Callable[..., Any], *args: Any) -> None:
+        # Background work runs inline so it is counted in the step that
+        # started it.
+        handler(*args)
+
+    def open(self, control: ft.Control) -> None:
+        self.dialogs.append(control)
+        self.update()
+
+    def close(self, control: ft.Control) -> None:
+        if control in self.dialogs:
+            self.dialogs.remove(control)
+        self.update()
+
+    # Same behaviour as main.route_change and main.view_pop, run synchronously.
+    def route_change(self) -> None:
+        self.views.clear()
+        self.session.set(REMOTE_CHANGE_KEY, None)
+        view = build_view(self, self.route)
+        self.session.set(COLD_START_KEY, False)
+        if view is not None:
+            self.views.append(view)
+        self.update()
+
+    def view_pop(self) -> None:
+        self.views.pop()
+        self.go(self.views[-1].route)
+
+    def go(self, route: str) -> None:
+        self.route = route
+        self.route_change()
+        self.update()
+
+
+# --- control helpers ---
+def walk(control: ft.Control) -> Iterator[ft.Control]:
+    yield control
+    for child in control._get_children():
+        yield from walk(child)
+
+
+def find(root: ft.Control, predicate: Callable[[ft.Control], bool]) -> ft.Control:
+    for control in walk(root):
+        if predicate(control):
+            return control
+    raise LookupError("Control not found")
+
+
+def with_text(text: str) -> Callable[[ft.Control], bool]:
+    return lambda c: getattr(c, "text", None) == text
+
+
+def fire(page: FakePage, control: ft.Control, event: str = "click") -> None:
+    handler = getattr(control, f"on_{event}")
+    handler(ft.ControlEvent(target="", name=event, data=None, control=control, page=page))
+
+
+def with_icon(icon: str) -> Callable[[ft.Control], bool]:
+    return lambda c: isinstance(c, ft.IconButton) and c.icon == icon
+
+
+def select(page: FakePage, texts: List[str]) -> None:
+    view = page.views[-1]
+    fire(page, find(view, with_icon(ft.Icons.CHECKLIST)))
+    for text in texts:
+        fire(page, find(view, with_text(text)))
+
+
+def pick_date(page: FakePage, button: ft.Control, value: str) -> None:
+    fire(page, button)
+    picker = page.dialogs[-1]
+    picker.value = datetime.fromisoformat(value)
+    fire(page, picker, "change")
+
+
+# --- steps ---
+def replay_add_vehicle(page: FakePage, plate: str, id: Optional[str] = None) -> Optional[str]:
+    before = set(get_registry(page).order)
+    fire(page, page.views[-1].floating_action_button)
+    dialog = page.dialogs[-1]
+    dialog.content.value = plate
+    fire(page, find(dialog, with_text("Add")))
+    added = [vehicle_id for vehicle_id in get_registry(page).order if vehicle_id not in before]
+    return added[0] if added else None
+
+
+def replay_edit_vehicle(page: FakePage, plate: str, new_plate: str) -> None:
+    fire(page, find(page.views[-1], with_text(plate)), "long_press")
+    dialog = page.dialogs[-1]
+    dialog.content.value = new_plate
+    fire(page, find(dialog, with_text("Save")))
+
+
+def replay_delete_vehicle(page: FakePage, plate: str) -> None:
+    fire(page, find(page.views[-1], with_text(plate)), "long_press")
+    fire(page, find(page.dialogs[-1], with_icon(ft.Icons.DELETE)))
+    fire(page, find(page.dialogs[-1], with_text("Delete")))
+
+
+def replay_delete_vehicles(page: FakePage, plates: List[str]) -> None:
+    select(page, plates)
+    fire(page, find(page.views[-1], with_icon(ft.Icons.DELETE)))
+    fire(page, find(page.dialogs[-1], with_text("Delete")))
+
+
+def replay_renew_vehicles(page: FakePage, plates: List[str], label: Optional[str], months: int) -> None:
+    select(page, plates)
+    fire(page, find(page.views[-1], with_icon(ft.Icons.EVENT_REPEAT)))
+    dialog = page.dialogs[-1]
+    label_dropdown, months_dropdown = dialog.content.controls
+    label_dropdown.value = label
+    months_dropdown.value = str(months)
+    fire(page, find(dialog, with_text("Renew")))
+
+
+def replay_add_event(page: FakePage, vehicle: str, label: Optional[str], expiration_date: Optional[str]) -> None:
+    fire(page, page.views[-1].floating_action_button)
+    dialog = page.dialogs[-1]
+    dropdown, date_button = dialog.content.controls
+    dropdown.value = label
+    if expiration_date:
+        pick_date(page, date_button, expiration_date)
+    fire(page, find(dialog, with_text("Add")))
+
+
+def replay_save_event(page: FakePage, vehicle: str, label: str, expiration_date: str) -> None:
+    view = page.views[-1]
+    pick_date(page, find(view, lambda c: getattr(c, "icon", None) == ft.Icons.CALENDAR_MONTH), expiration_date)
+    fire(page, find(view, with_text("Save")))
+
+
+def replay_delete_event(page: FakePage, vehicle: str, label: str) -> None:
+    fire(page, find(page.views[-1], with_text("Delete")))
+    fire(page, find(page.dialogs[-1], with_text("Delete")))
+
+
+def replay_delete_events(page: FakePage, vehicle: str, labels: List[str]) -> None:
+    select(page, labels)
+    fire(page, find(page.views[-1], with_icon(ft.Icons.DELETE)))
+    fire(page, find(page.dialogs[-1], with_text("Delete")))
+
+
+def replay_renew_events(page: FakePage, vehicle: str, labels: List[str], months: int) -> None:
+    select(page, labels)
+    fire(page, find(page.views[-1], with_icon(ft.Icons.EVENT_REPEAT)))
+    dialog = page.dialogs[-1]
+    dialog.content.value = str(months)
+    fire(page, find(dialog, with_text("Renew")))
+
+
+STEPS: Dict[str, Callable[..., None]] = {
+    "route": lambda page, route: page.go(route),
+    "pop": lambda page: page.view_pop(),
+    "add_vehicle": replay_add_vehicle,
+    "edit_vehicle": replay_edit_vehicle,
+    "delete_vehicle": replay_delete_vehicle,
+    "delete_vehicles": replay_delete_vehicles,
+    "renew_vehicles": replay_renew_vehicles,
+    "add_event": replay_add_event,
+    "save_event": replay_save_event,
+    "delete_event": replay_delete_event,
+    "delete_events": replay_delete_events,
+    "renew_events": replay_renew_events,
+}
+
+
+def remap_ids(args: Dict[str, Any], ids: Dict[str, str]) -> Dict[str, Any]:
+    # Vehicles added during the session get new ids when replayed.
+    if not ids:
+        return args
+    mapped = dict(args)
+    if "vehicle" in mapped:
+        mapped["vehicle"] = ids.get(mapped["vehicle"], mapped["vehicle"])
+    if "route" in mapped:
+        mapped["route"] = "/".join(ids.get(part, part) for part in mapped["route"].split("/"))
+    return mapped
+
+
+def replay(header: Dict[str, Any], steps: List[Step]) -> List[Dict[str, Any]]:
+    page = FakePage(header.get("storage") or {})
+    results = []
+    ids: Dict[str, str] = {}
+    previous = None
+    redirected = False
+    for i, (at, kind, args) in enumerate(steps):
+        args = remap_ids(args, ids)
+        induced = (
+            kind == "route"
+            and page.route == args["route"]
+            and (previous not in (None, "route") or redirected)
+        )
+        previous = kind
+        redirected = False
+        if induced:
+            # Navigation done by the previous handler (or pop, or a view
+            # redirecting) also reaches route_change and gets recorded; it
+            # was already replayed and measured as part of that step.
+            continue
+        # Whatever the user did with a dialog that stayed open (e.g. after a
+        # validation error) is not part of the trace, so start clean.
+        page.dialogs.clear()
+        gets, sets, updates = page.client_storage.gets, page.client_storage.sets, page.updates
+        error = None
+        started = time.perf_counter()
+        try:
+            created = STEPS[kind](page, **args)
+            if kind == "add_vehicle" and args.get("id") and created:
+                ids[args["id"]] = created
+        except Exception as ex:
+            error = f"{type(ex).__name__}: {ex}"
+        if kind == "route" and error is None and page.route != args["route"]:
+            following = steps[i + 1] if i + 1 < len(steps) else None
+            redirected = following is not None and following[1] == "route" and (
+                remap_ids(following[2], ids)["route"] == page.route
+            )
+            if not redirected:
+                # The recorded session stayed on this route; the replay did not.
+                error = f"Redirected from {args['route']} to {page.route}"
+        results.append({
+            "at": at,
+            "kind": kind,
+            "args": args,
+            "ms": (time.perf_counter() - started) * 1000,
+            "gets": page.client_storage.gets - gets,
+            "sets": page.client_storage.sets - sets,
+            "updates": page.updates - updates,
+            "error": error,
+        })
+    return results
+
+
+def print_report(results: List[Dict[str, Any]]) -> None:
+    print(f"{'#':>4} {'at (s)':>8} {'step':<16} {'ms':>9} {'gets':>6} {'sets':>6} {'updates':>8}")
+    for i, r in enumerate(results, 1):
+        print(f"{i:>4} {r['at'] / 1000:>8.1f} {r['kind']:<16} {r['ms']:>9.2f} {r['gets']:>6} {r['sets']:>6} {r['updates']:>8}")
+        if r["error"]:
+            print(f"{'':>14}! {r['error']}")
+    print(
+        f"total: {len(results)} steps, {sum(r['ms'] for r in results):.2f} ms, "
+        f"{sum(r['gets'] for r in results)} gets, {sum(r['sets'] for r in results)} sets, "
+        f"{sum(r['updates'] for r in results)} updates, {sum(1 for r in results if r['error'])} errors"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a recorded Mașinică session headlessly.")
+    parser.add_argument("trace", help="trace file written by the recorder (trace-*.jsonl.gz)")
+    parser.add_argument("--json", action="store_true", help="print per-step results as JSON")
+    args = parser.parse_args()
+
+    results = replay(*read_trace(args.trace))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+
+
+if __name__ == "__main__":
+    main()
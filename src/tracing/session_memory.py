@@ -0,0 +1,92 @@
+import argparse
+import gc
+import resource
+import tracemalloc
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+from storage.plates import COUNTIES
+from tracing.replay import FakePage, FakeStorage
+
+LABELS = ("RCA", "CASCO", "ITP", "ROVINIETA")
+
+
+def fleet(vehicles: int) -> Dict[str, Any]:
+    # Legacy layout; the first session migrates it like a real upgrade would.
+    today = date.today()
+    plates = [f"{COUNTIES[i % len(COUNTIES)]} {10 + i // len(COUNTIES) % 90} ABC" for i in range(vehicles)]
+    events = [
+        {"vehicle": plate, "label": label, "expiration_date": (today + timedelta(days=(i * 7 + j * 11) % 60 - 10)).isoformat()}
+        for i, plate in enumerate(plates)
+        for j, label in enumerate(LABELS)
+    ]
+    return {"vehicles": plates, "events": events}
+
+
+def resident_kb() -> int:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    # Peak rather than current RSS, but the best we get outside Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def open_session(storage: FakeStorage) -> FakePage:
+    page = FakePage({})
+    # In web mode client storage lives in the browser, so sessions share the
+    # encoded values and only server-side state is measured.
+    page.client_storage.data = dict(storage.data)
+    page.go("/")
+    first = page.client_storage.get("vehicle_registry")["order"][0]
+    page.go(f"/vehicle/{first}")
+    return page
+
+
+def measure(steps: List[int], vehicles: int, trace_heap: bool) -> List[Dict[str, Optional[float]]]:
+    storage = FakeStorage(fleet(vehicles))
+    # Warm up imports and shared caches, and keep the migrated layout so
+    # every measured session starts like a returning user.
+    storage.data = open_session(storage).client_storage.data
+
+    gc.collect()
+    if trace_heap:
+        tracemalloc.start()
+    base_rss = resident_kb()
+    base_heap = tracemalloc.get_traced_memory()[0] if trace_heap else 0
+
+    sessions: List[FakePage] = []
+    results = []
+    for target in steps:
+        while len(sessions) < target:
+            sessions.append(open_session(storage))
+        gc.collect()
+        rss = resident_kb() - base_rss
+        heap = tracemalloc.get_traced_memory()[0] - base_heap if trace_heap else None
+        results.append({
+            "sessions": target,
+            "rss_kb": rss,
+            "rss_kb_per_session": rss / target,
+            "heap_kb_per_session": heap / 1024 / target if heap is not None else None,
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Resident memory per simulated web session (FakePage, not a real Flet session).")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 50, 100, 200])
+    parser.add_argument("--vehicles", type=int, default=20, help="vehicles per session (4 events each)")
+    parser.add_argument("--heap", action="store_true", help="also trace Python heap allocations (slower)")
+    args = parser.parse_args()
+
+    print("Simulated sessions (FakePage): app state only, without Flet's own per-connection cost.")
+    print(f"{'sessions':>8} {'RSS (KB)':>10} {'RSS/session':>12} {'heap/session':>13}")
+    for r in measure(sorted(args.sessions), args.vehicles, args.heap):
+        heap = f"{r['heap_kb_per_session']:>13.1f}" if r["heap_kb_per_session"] is not None else f"{'-':>13}"
+        print(f"{r['sessions']:>8} {r['rss_kb']:>10} {r['rss_kb_per_session']:>12.1f} {heap}")
+
+
+if __name__ == "__main__":
+    main()
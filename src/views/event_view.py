@@ -1,10 +1,23 @@
 from datetime import datetime, date
 from typing import Optional, List, Dict
 import flet as ft
+from themes.catppuccin_theme import theme_styles
+from storage.urgency import get_summaries
+from storage.vehicle_registry import get_registry
+from sync.protocol import Change, event_key
+from sync.versions import REMOTE_CHANGE_KEY, get_tracker
+from tracing.recorder import trace_event
 
 
-def event_view(page: ft.Page, license_plate: str, event_type: str) -> ft.View:
+def event_view(page: ft.Page, vehicle_id: str, event_type: str) -> ft.View:
+    license_plate = get_registry(page).plate(vehicle_id)
+    if license_plate is None:
+        page.go("/")
+        return
+
     page.title = f"Mașinică - {license_plate} - {event_type}"
+    tracker = get_tracker(page)
+    summaries = get_summaries(page)
 
     # --- storage helpers ---
     def _get_saved_events() -> List[Dict]:
@@ -13,7 +26,7 @@ def event_view(page: ft.Page, license_plate: str, event_type: str) -> ft.View:
     def _get_saved_event() -> Optional[Dict]:
         evts = _get_saved_events()
         for evt in evts:
-            if evt.get("vehicle") == license_plate and evt.get("label") == event_type:
+            if evt.get("vehicle_id") == vehicle_id and evt.get("label") == event_type:
                 return evt
         return None
 
@@ -22,23 +35,33 @@ def event_view(page: ft.Page, license_plate: str, event_type: str) -> ft.View:
 
     event = _get_saved_event()
     if event is None:
-        page.go(f"/vehicle/{license_plate}")
+        page.go(f"/vehicle/{vehicle_id}")
         return
     
     def save_event(label: str, expiration_date: date) -> None:
-        evts = _get_saved_events()
-        for evt in evts:
-            if evt.get("vehicle") == license_plate and evt.get("label") == label:
-                evt["expiration_date"] = expiration_date.isoformat()
-                break
-        _set_saved_events(evts)
-        page.go(f"/vehicle/{license_plate}")
+        trace_event(page, "save_event", vehicle=vehicle_id, label=label, expiration_date=expiration_date.isoformat())
+        with tracker.lock:
+            evts = _get_saved_events()
+            for evt in evts:
+                if evt.get("vehicle_id") == vehicle_id and evt.get("label") == label:
+                    evt["expiration_date"] = expiration_date.isoformat()
+                    break
+            _set_saved_events(evts)
+            summaries.set_event(vehicle_id, label, expiration_date.isoformat())
+            summaries.save(page)
+            tracker.touch("events", [event_key(vehicle_id, label)])
+        page.go(f"/vehicle/{vehicle_id}")
 
     def delete_event(label: str) -> None:
-        evts = _get_saved_events()
-        evts = [evt for evt in evts if not (evt.get("vehicle") == license_plate and evt.get("label") == label)]
-        _set_saved_events(evts)
-        page.go(f"/vehicle/{license_plate}")
+        trace_event(page, "delete_event", vehicle=vehicle_id, label=label)
+        with tracker.lock:
+            evts = _get_saved_events()
+            evts = [evt for evt in evts if not (evt.get("vehicle_id") == vehicle_id and evt.get("label") == label)]
+            _set_saved_events(evts)
+            summaries.remove_event(vehicle_id, label)
+            summaries.save(page)
+            tracker.touch("events", [event_key(vehicle_id, label)], deleted=True)
+        page.go(f"/vehicle/{vehicle_id}")
     
     selected_date: Optional[date] = None
 
@@ -72,7 +95,7 @@ def event_view(page: ft.Page, license_plate: str, event_type: str) -> ft.View:
             ft.TextButton(
                 "Delete",
                 on_click=lambda e: delete_event(event_type),
-                style=ft.ButtonStyle(color=page.theme.color_scheme.error),
+                style=theme_styles(page.theme).danger_button(),
             ),
         ],
     )
@@ -103,20 +126,63 @@ def event_view(page: ft.Page, license_plate: str, event_type: str) -> ft.View:
             color=color,
         )
 
+    def _remaining_days() -> int:
+        return (datetime.fromisoformat(event.get('expiration_date')).date() - datetime.now().date()).days
+
+    remaining_row = ft.Row(
+        [
+            ft.Text(
+                f"{event.get('label')}:",
+                size=20,
+            ),
+            _remaining_days_text(_remaining_days()),
+        ],
+    )
+
+    app_bar = ft.AppBar(
+        title=ft.Text(f"{license_plate} - {event_type}"),
+        leading=ft.IconButton(
+            icon=ft.Icons.ARROW_BACK,
+            on_click=lambda e: page.go(f"/vehicle/{vehicle_id}"),
+        ),
+    )
+
+    # --- remote changes ---
+    def leave(route: str) -> None:
+        if delete_event_dialog.open:
+            page.close(delete_event_dialog)
+        page.go(route)
+
+    def on_remote_change(changes: List[Change]) -> None:
+        nonlocal license_plate
+        for change in changes:
+            gone = change["deleted"] or change["data"] is None
+            if change["store"] == "vehicles" and change["key"] == vehicle_id:
+                if gone:
+                    leave("/")
+                    return
+                license_plate = change["data"]["plate"]
+                page.title = f"Mașinică - {license_plate} - {event_type}"
+                app_bar.title = ft.Text(f"{license_plate} - {event_type}")
+            elif change["store"] == "events" and change["key"] == event_key(vehicle_id, event_type):
+                if gone:
+                    leave(f"/vehicle/{vehicle_id}")
+                    return
+                event.update(change["data"])
+                remaining_row.controls[1] = _remaining_days_text(_remaining_days())
+                if selected_date is None:
+                    # Keep a date the user picked but has not saved yet.
+                    date_picker.text = datetime.fromisoformat(event.get('expiration_date')).strftime('%d/%m/%Y')
+        page.update()
+
+    page.session.set(REMOTE_CHANGE_KEY, on_remote_change)
+
     return ft.View(
-        f"/vehicle/{license_plate}/{event_type}",
+        f"/vehicle/{vehicle_id}/{event_type}",
         [
             ft.Column(
                 [
-                    ft.Row(
-                        [
-                            ft.Text(
-                                f"{event.get('label')}:",
-                                size=20,
-                            ),
-                            _remaining_days_text((datetime.fromisoformat(event.get('expiration_date')).date() - datetime.now().date()).days),
-                        ],  
-                    ),
+                    remaining_row,
                     ft.Row(
                         [
                             ft.Text(
@@ -155,12 +221,6 @@ def event_view(page: ft.Page, license_plate: str, event_type: str) -> ft.View:
                 ),
                 padding=ft.padding.only(bottom=20),
             ),
-            ft.AppBar(
-                title=ft.Text(f"{license_plate} - {event_type}"),
-                leading=ft.IconButton(
-                    icon=ft.Icons.ARROW_BACK,
-                    on_click=lambda e: page.go(f"/vehicle/{license_plate}"),
-                ),
-            ),
+            app_bar,
         ],
     )
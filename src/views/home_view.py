@@ -1,9 +1,30 @@
 import flet as ft
-from typing import List, Dict, Optional
+from datetime import datetime
+from typing import List, Optional, Set
+from themes.catppuccin_theme import theme_styles
+from storage import bulk
+from storage.home_snapshot import COLD_START_KEY, Row, load_snapshot, save_snapshot, snapshot_row, snapshot_rows
+from storage.plates import canonical_key, normalize_plate
+from storage.urgency import get_summaries
+from storage.vehicle_registry import get_registry, new_vehicle_id
+from sync.protocol import Change
+from sync.versions import REMOTE_CHANGE_KEY, get_tracker
+from tracing.recorder import trace_event
 
 
 def home_view(page: ft.Page) -> ft.View:
     page.title = "Mașinică - Vehicles"
+    today = datetime.now().date()
+    styles = theme_styles(page.theme)
+    registry = summaries = None
+    selecting = False
+    selected: Set[str] = set()
+
+    # On a cold start paint the rows persisted by the last session right
+    # away and revalidate them against the stores in the background. The
+    # registry may already be loaded by then (sync, trace recording), so
+    # only the session flag tells.
+    snapshot = load_snapshot(page) if page.session.get(COLD_START_KEY) else None
 
     vehicles = ft.Column(spacing=20)
 
@@ -15,61 +36,119 @@ def home_view(page: ft.Page) -> ft.View:
     )
     helper_text = ft.Text(
         "Press and hold a vehicle to edit or delete it.",
-        style=ft.TextStyle(color=page.theme.color_scheme.on_background),
+        style=styles.helper_text,
         text_align=ft.TextAlign.CENTER,
         italic=True,
     )
 
     # --- storage helpers ---
-    def _get_saved_vehicles() -> List[str]:
-        return page.client_storage.get("vehicles") or []
-
-    def _set_saved_vehicles(plates: List[str]) -> None:
-        page.client_storage.set("vehicles", plates)
-
-    def _get_saved_events() -> List[Dict]:
-        return page.client_storage.get("events") or []
-
-    def _set_saved_events(evts: List[Dict]) -> None:
-        page.client_storage.set("events", evts)
-
-    def delete_events(license_plate: str) -> None:
-        new_events = [e for e in _get_saved_events() if e.get("vehicle") != license_plate]
-        _set_saved_events(new_events)
-
-    def save_vehicles() -> None:
-        license_plates = [getattr(veh, "text", None) for veh in vehicles.controls]
-        license_plates = [p for p in license_plates if p]
-        _set_saved_vehicles(license_plates)
-
-    def load_vehicles() -> None:
+    def load_stores() -> None:
+        # The change tracker is only fetched when something is written, so
+        # painting and revalidating the rows reads nothing but the registry
+        # and the urgency summaries.
+        nonlocal registry, summaries
+        registry = get_registry(page)
+        summaries = get_summaries(page)
+
+    def current_rows() -> List[Row]:
+        rows = snapshot_rows(registry, summaries, today)
+        save_snapshot(page, rows)
+        return rows
+
+    def load_vehicles(rows: List[Row]) -> None:
         vehicles.controls.clear()
-        saved_vehicles = _get_saved_vehicles()
-        for license_plate in saved_vehicles:
-            vehicles.controls.append(create_vehicle(license_plate))
+        for row in rows:
+            vehicles.controls.append(create_vehicle(row))
+
+    def revalidate() -> None:
+        load_stores()
+        fresh = current_rows()
+        existing = {veh.data["id"]: veh for veh in vehicles.controls}
+        controls = []
+        for row in fresh:
+            veh = existing.get(row["id"])
+            if veh is None:
+                veh = create_vehicle(row)
+            elif veh.data != row:
+                update_vehicle(veh, row)
+            controls.append(veh)
+        if controls != vehicles.controls:
+            vehicles.controls[:] = controls
+        selected.intersection_update(row["id"] for row in fresh)
+        if selecting:
+            update_selection_bar()
+        update_empty_state()
+
+    def on_remote_change(changes: List[Change]) -> None:
+        # Any vehicle or event can change a row here.
+        revalidate()
 
     def update_empty_state() -> None:
-        saved_vehicles = _get_saved_vehicles()
-        no_vehicles_text.visible = len(saved_vehicles) == 0
-        helper_text.visible = len(saved_vehicles) > 0
+        no_vehicles_text.visible = len(vehicles.controls) == 0
+        helper_text.visible = len(vehicles.controls) > 0
         page.update()
 
     def open_vehicle(e: ft.ControlEvent) -> None:
-        page.go(f"/vehicle/{e.control.text}")
+        if selecting:
+            toggle_selected(e.control)
+            page.update()
+            return
+        page.go(f"/vehicle/{e.control.data['id']}")
+
+    def on_vehicle_long_press(e: ft.ControlEvent) -> None:
+        if selecting:
+            open_vehicle(e)
+        else:
+            open_edit_vehicle_dialog(e)
+
+    # --- UI helpers ---
+    def vehicle_badge(row: Row) -> Optional[ft.Badge]:
+        if row["summary"] is None:
+            return None
+        bgcolor = None
+        if row["tone"] == "error":
+            bgcolor = page.theme.color_scheme.error
+        elif row["tone"] == "tertiary":
+            bgcolor = page.theme.color_scheme.tertiary
+        return ft.Badge(
+            row["summary"],
+            bgcolor=bgcolor,
+            alignment=ft.alignment.bottom_center,
+            offset=(0, 8),
+        )
+
+    def vehicle_icon(vehicle_id: str) -> str:
+        if not selecting:
+            return ft.Icons.DIRECTIONS_CAR
+        return ft.Icons.CHECK_BOX if vehicle_id in selected else ft.Icons.CHECK_BOX_OUTLINE_BLANK
 
-    def create_vehicle(label: str) -> ft.Control:
+    def update_vehicle(veh: ft.ElevatedButton, row: Row) -> None:
+        veh.text = row["plate"]
+        veh.badge = vehicle_badge(row)
+        veh.data = row
+
+    def create_vehicle(row: Row) -> ft.Control:
+        # A plain icon + text button with a badge: no child controls, and
+        # every row shares the same two handlers.
         return ft.ElevatedButton(
-            icon=ft.Icons.DIRECTIONS_CAR,
-            text=label,
+            icon=vehicle_icon(row["id"]),
+            text=row["plate"],
+            badge=vehicle_badge(row),
+            data=row,
             width=page.width * 0.8,
             height=50,
             on_click=open_vehicle,
-            on_long_press=open_edit_vehicle_dialog,
+            on_long_press=on_vehicle_long_press,
         )
 
-    def add_vehicle(label: str) -> None:
-        vehicles.controls.append(create_vehicle(label))
-        save_vehicles()
+    def add_vehicle(plate: str, vehicle_id: str) -> None:
+        tracker = get_tracker(page)
+        with tracker.lock:
+            registry.add(plate, vehicle_id)
+            registry.save(page)
+            tracker.touch("vehicles", [vehicle_id])
+        vehicles.controls.append(create_vehicle(snapshot_row(registry, summaries, vehicle_id, today)))
+        current_rows()
         update_empty_state()
         page.update()
 
@@ -90,20 +169,29 @@ def home_view(page: ft.Page) -> ft.View:
         page.close(new_vehicle_dialog)
 
     def confirm_add_vehicle(e: Optional[ft.ControlEvent] = None) -> None:
+        # Pick the id up front so the trace can map it when replayed.
+        vehicle_id = new_vehicle_id()
+        trace_event(page, "add_vehicle", plate=license_plate_input.value, id=vehicle_id)
+        load_stores()
         value = (license_plate_input.value or "").strip()
         if not value:
             license_plate_input.error_text = "License plate\ncannot be empty."
             page.update()
             return
 
-        saved_vehicles = _get_saved_vehicles()
-        if value in saved_vehicles:
+        plate = normalize_plate(value)
+        if plate is None:
+            license_plate_input.error_text = "Not a valid Romanian\nlicense plate."
+            page.update()
+            return
+
+        if registry.find(plate) is not None:
             license_plate_input.error_text = "Vehicle already exists."
             page.update()
             return
 
         license_plate_input.error_text = None
-        add_vehicle(value)
+        add_vehicle(plate, vehicle_id)
         close_new_vehicle_dialog()
 
     new_vehicle_dialog.actions = [
@@ -118,7 +206,9 @@ def home_view(page: ft.Page) -> ft.View:
 
     # Edit vehicle dialog
     def open_edit_vehicle_dialog(e: ft.ControlEvent) -> None:
+        load_stores()
         vehicle_button = e.control
+        vehicle_id = vehicle_button.data["id"]
         old_label = vehicle_button.text
 
         edit_license_plate_input = ft.TextField(
@@ -138,48 +228,58 @@ def home_view(page: ft.Page) -> ft.View:
             page.close(edit_vehicle_dialog)
 
         def confirm_edit_vehicle(ev: Optional[ft.ControlEvent] = None) -> None:
+            trace_event(page, "edit_vehicle", plate=old_label, new_plate=edit_license_plate_input.value)
             new_label = (edit_license_plate_input.value or "").strip()
             if not new_label:
                 edit_license_plate_input.error_text = "License plate cannot be empty."
                 page.update()
                 return
 
-            saved_vehicles = _get_saved_vehicles()
-            # If new_label already exists (and isn't the same as old), show error
-            if new_label in saved_vehicles and new_label != old_label:
+            if canonical_key(new_label) == canonical_key(old_label):
+                # Same plate: fix up the spelling, but keep a legacy plate
+                # that predates validation (e.g. a foreign one) as it was.
+                new_label = normalize_plate(new_label) or old_label
+            else:
+                new_label = normalize_plate(new_label)
+            if new_label is None:
+                edit_license_plate_input.error_text = "Not a valid Romanian\nlicense plate."
+                page.update()
+                return
+
+            if vehicle_id not in registry:
+                # Deleted on another device while the dialog was open.
+                close_edit_vehicle_dialog()
+                return
+
+            # If new_label belongs to another vehicle, show error
+            existing_id = registry.find(new_label)
+            if existing_id is not None and existing_id != vehicle_id:
                 edit_license_plate_input.error_text = "Another vehicle with this plate\nalready exists."
                 page.update()
                 return
 
             # Update the button text
             vehicle_button.text = new_label
-
-            # Update saved vehicles list order and persist
-            plates = [getattr(veh, "text", None) for veh in vehicles.controls]
-            plates = [p for p in plates if p]
-            _set_saved_vehicles(plates)
-
-            # Update events related to this vehicle (rename vehicle tag)
-            evts = _get_saved_events()
-            changed = False
-            for item in evts:
-                if item.get("vehicle") == old_label:
-                    item["vehicle"] = new_label
-                    changed = True
-            if changed:
-                _set_saved_events(evts)
+            if new_label != old_label:
+                # Events reference the vehicle id, so a rename only touches
+                # the registry entry.
+                tracker = get_tracker(page)
+                with tracker.lock:
+                    registry.rename(vehicle_id, new_label)
+                    registry.save(page)
+                    tracker.touch("vehicles", [vehicle_id])
+                update_vehicle(vehicle_button, snapshot_row(registry, summaries, vehicle_id, today))
+                current_rows()
 
             page.update()
             close_edit_vehicle_dialog()
 
         def delete_vehicle(ev: Optional[ft.ControlEvent] = None) -> None:
-            # Capture label before mutating controls
-            label_to_remove = old_label
-            vehicles.controls[:] = [veh for veh in vehicles.controls if getattr(veh, "text", None) != label_to_remove]
-            delete_events(label_to_remove)
-            save_vehicles()
+            trace_event(page, "delete_vehicle", plate=old_label)
+            vehicles.controls[:] = [veh for veh in vehicles.controls if veh.data["id"] != vehicle_id]
+            bulk.delete_vehicles(page, [vehicle_id])
+            current_rows()
             update_empty_state()
-            page.update()
             close_edit_vehicle_dialog()
             page.close(confirm_delete_vehicle_dialog)
 
@@ -192,7 +292,7 @@ def home_view(page: ft.Page) -> ft.View:
                 ft.TextButton(
                     "Delete",
                     on_click=delete_vehicle,
-                    style=ft.ButtonStyle(color=page.theme.color_scheme.error),
+                    style=styles.danger_button(),
                 ),
             ],
         )
@@ -215,6 +315,150 @@ def home_view(page: ft.Page) -> ft.View:
 
         page.open(edit_vehicle_dialog)
 
+    # Selection mode
+    def selected_plates() -> List[str]:
+        return [veh.text for veh in vehicles.controls if veh.data["id"] in selected]
+
+    def toggle_selected(veh: ft.ElevatedButton) -> None:
+        selected.symmetric_difference_update({veh.data["id"]})
+        veh.icon = vehicle_icon(veh.data["id"])
+        update_selection_bar()
+
+    def update_selection_bar() -> None:
+        if selecting:
+            app_bar.leading = ft.IconButton(ft.Icons.CLOSE, tooltip="Cancel", on_click=toggle_selecting)
+            app_bar.title = ft.Text(f"{len(selected)} selected")
+            app_bar.actions = selection_actions
+            for action in selection_actions[1:]:
+                action.disabled = not selected
+        else:
+            app_bar.leading = ft.Icon(ft.Icons.HOME)
+            app_bar.title = None
+            app_bar.actions = [select_button]
+        helper_text.value = "Tap vehicles to select them." if selecting else "Press and hold a vehicle to edit or delete it."
+        add_vehicle_button.visible = not selecting
+
+    def set_selecting(value: bool) -> None:
+        nonlocal selecting
+        selecting = value
+        selected.clear()
+        for veh in vehicles.controls:
+            veh.icon = vehicle_icon(veh.data["id"])
+        update_selection_bar()
+
+    def toggle_selecting(e: ft.ControlEvent) -> None:
+        set_selecting(not selecting)
+        page.update()
+
+    def select_all(e: ft.ControlEvent) -> None:
+        ids = {veh.data["id"] for veh in vehicles.controls}
+        if selected >= ids:
+            selected.clear()
+        else:
+            selected.update(ids)
+        for veh in vehicles.controls:
+            veh.icon = vehicle_icon(veh.data["id"])
+        update_selection_bar()
+        page.update()
+
+    # Bulk delete dialog
+    def delete_selected(e: Optional[ft.ControlEvent] = None) -> None:
+        trace_event(page, "delete_vehicles", plates=selected_plates())
+        load_stores()
+        bulk.delete_vehicles(page, selected)
+        vehicles.controls[:] = [veh for veh in vehicles.controls if veh.data["id"] not in selected]
+        current_rows()
+        set_selecting(False)
+        update_empty_state()
+        page.close(delete_vehicles_dialog)
+
+    delete_vehicles_dialog = ft.AlertDialog(
+        modal=True,
+        title=ft.Text("Delete Vehicles"),
+        content=ft.Text(),
+        actions=[
+            ft.TextButton("Cancel", on_click=lambda _: page.close(delete_vehicles_dialog)),
+            ft.TextButton("Delete", on_click=delete_selected, style=styles.danger_button()),
+        ],
+    )
+
+    def open_delete_vehicles_dialog(e: ft.ControlEvent) -> None:
+        count = len(selected)
+        delete_vehicles_dialog.content.value = (
+            f"Are you sure you want to delete {count} vehicle{'' if count == 1 else 's'} and all their events?"
+        )
+        page.open(delete_vehicles_dialog)
+
+    # Bulk renew dialog
+    renew_label_dropdown = ft.Dropdown(
+        label="Event Type",
+        options=[
+            ft.dropdown.Option("RCA"),
+            ft.dropdown.Option("CASCO"),
+            ft.dropdown.Option("ITP"),
+            ft.dropdown.Option("ROVINIETA"),
+        ],
+    )
+    renew_months_dropdown = ft.Dropdown(
+        label="Extend by",
+        options=[ft.dropdown.Option(str(m), f"{m} month{'' if m == 1 else 's'}") for m in bulk.RENEW_MONTHS],
+    )
+
+    renew_vehicles_dialog = ft.AlertDialog(
+        modal=True,
+        title=ft.Text("Renew Events"),
+        content=ft.Column([renew_label_dropdown, renew_months_dropdown], tight=True),
+    )
+
+    def confirm_renew_selected(e: Optional[ft.ControlEvent] = None) -> None:
+        label = renew_label_dropdown.value
+        months = int(renew_months_dropdown.value)
+        trace_event(page, "renew_vehicles", plates=selected_plates(), label=label, months=months)
+        if label is None:
+            renew_label_dropdown.error_text = "Please select\nan event type."
+            page.update()
+            return
+
+        load_stores()
+        renewed = {vehicle_id for vehicle_id, _ in bulk.renew_events(page, {(i, label) for i in selected}, months)}
+        if not renewed:
+            renew_label_dropdown.error_text = f"None of the selected\nvehicles has {label}."
+            page.update()
+            return
+
+        for veh in vehicles.controls:
+            if veh.data["id"] in renewed:
+                update_vehicle(veh, snapshot_row(registry, summaries, veh.data["id"], today))
+        current_rows()
+        set_selecting(False)
+        page.update()
+        page.close(renew_vehicles_dialog)
+
+    renew_vehicles_dialog.actions = [
+        ft.TextButton("Cancel", on_click=lambda _: page.close(renew_vehicles_dialog)),
+        ft.TextButton("Renew", on_click=confirm_renew_selected),
+    ]
+
+    def open_renew_vehicles_dialog(e: ft.ControlEvent) -> None:
+        renew_label_dropdown.value = None
+        renew_label_dropdown.error_text = None
+        renew_months_dropdown.value = str(bulk.RENEW_MONTHS[-1])
+        page.open(renew_vehicles_dialog)
+
+    select_button = ft.IconButton(ft.Icons.CHECKLIST, tooltip="Select", on_click=toggle_selecting)
+    selection_actions = [
+        ft.IconButton(ft.Icons.SELECT_ALL, tooltip="Select all", on_click=select_all),
+        ft.IconButton(ft.Icons.EVENT_REPEAT, tooltip="Renew", on_click=open_renew_vehicles_dialog),
+        ft.IconButton(
+            ft.Icons.DELETE,
+            tooltip="Delete",
+            icon_color=page.theme.color_scheme.error,
+            on_click=open_delete_vehicles_dialog,
+        ),
+    ]
+    app_bar = ft.AppBar(leading=ft.Icon(ft.Icons.HOME), actions=[select_button])
+    add_vehicle_button = ft.FloatingActionButton(icon=ft.Icons.ADD, on_click=open_new_vehicle_dialog)
+
     def on_resize(e: ft.ControlEvent) -> None:
         for veh in vehicles.controls:
             try:
@@ -224,9 +468,16 @@ def home_view(page: ft.Page) -> ft.View:
         page.update()
 
     page.on_resize = on_resize
+    page.session.set(REMOTE_CHANGE_KEY, on_remote_change)
 
-    load_vehicles()
-    update_empty_state()
+    if snapshot is None:
+        load_stores()
+        load_vehicles(current_rows())
+        update_empty_state()
+    else:
+        load_vehicles(snapshot)
+        update_empty_state()
+        page.run_thread(revalidate)
 
     return ft.View(
         "/",
@@ -253,12 +504,7 @@ def home_view(page: ft.Page) -> ft.View:
                 alignment=ft.alignment.bottom_center,
                 padding=ft.padding.only(bottom=60),
             ),
-            ft.AppBar(
-                leading=ft.Icon(ft.Icons.HOME),
-            ),
+            app_bar,
         ],
-        floating_action_button=ft.FloatingActionButton(
-            icon=ft.Icons.ADD,
-            on_click=open_new_vehicle_dialog,
-        ),
+        floating_action_button=add_vehicle_button,
     )
\ No newline at end of file
@@ -0,0 +1,19 @@
+from typing import Optional
+import flet as ft
+from views.home_view import home_view
+from views.vehicle_view import vehicle_view
+from views.event_view import event_view
+
+
+def build_view(page: ft.Page, route: str) -> Optional[ft.View]:
+    if route == "/":
+        return home_view(page)
+    elif route.startswith("/vehicle/"):
+        parts = route.split("/vehicle/")[1].split("/")
+        vehicle_id = parts[0]
+        if len(parts) == 1:
+            return vehicle_view(page, vehicle_id)
+        else:
+            event_type = parts[1]
+            return event_view(page, vehicle_id, event_type)
+    return None
@@ -1,13 +1,30 @@
 from datetime import datetime, date
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Set
 import flet as ft
+from themes.catppuccin_theme import theme_styles
+from storage import bulk
+from storage.urgency import get_summaries
+from storage.vehicle_registry import get_registry
+from sync.protocol import Change, event_key
+from sync.versions import REMOTE_CHANGE_KEY, get_tracker
+from tracing.recorder import trace_event
 
 
-def vehicle_view(page: ft.Page, license_plate: str) -> ft.View:
+def vehicle_view(page: ft.Page, vehicle_id: str) -> ft.View:
+    license_plate = get_registry(page).plate(vehicle_id)
+    if license_plate is None:
+        page.go("/")
+        return
+
     page.title = f"Mașinică - {license_plate}"
+    tracker = get_tracker(page)
+    summaries = get_summaries(page)
+    styles = theme_styles(page.theme)
 
     events = ft.Column(spacing=20)
     selected_date: Optional[date] = None
+    selecting = False
+    selected: Set[str] = set()
 
     no_events_text = ft.Text(
         'No events added yet.\nClick the "+" button to add a new event.',
@@ -17,7 +34,7 @@ def vehicle_view(page: ft.Page, license_plate: str) -> ft.View:
     )
     helper_text = ft.Text(
         "Tap an event to view or edit it.",
-        style=ft.TextStyle(color=page.theme.color_scheme.on_background),
+        style=styles.helper_text,
         text_align=ft.TextAlign.CENTER,
         italic=True,
     )
@@ -30,18 +47,34 @@ def vehicle_view(page: ft.Page, license_plate: str) -> ft.View:
         page.client_storage.set("events", evts)
 
     def save_event(label: str, expiration_date: date) -> None:
-        evts = _get_saved_events()
-        evts.append({
-            "vehicle": license_plate,
-            "label": label,
-            "expiration_date": expiration_date.isoformat(),
-        })
-        _set_saved_events(evts)
+        with tracker.lock:
+            evts = _get_saved_events()
+            evts.append({
+                "vehicle_id": vehicle_id,
+                "label": label,
+                "expiration_date": expiration_date.isoformat(),
+            })
+            _set_saved_events(evts)
+            summaries.set_event(vehicle_id, label, expiration_date.isoformat())
+            summaries.save(page)
+            tracker.touch("events", [event_key(vehicle_id, label)])
 
     # --- UI helpers ---
     def _badge_text(days: int) -> str:
         return f"{days} day" + ('' if abs(days) == 1 else 's')
 
+    def open_event(e: ft.ControlEvent) -> None:
+        if selecting:
+            toggle_selected(e.control)
+            page.update()
+            return
+        page.go(f"/vehicle/{vehicle_id}/{e.control.data}")
+
+    def event_icon(label: str) -> Optional[str]:
+        if not selecting:
+            return None
+        return ft.Icons.CHECK_BOX if label in selected else ft.Icons.CHECK_BOX_OUTLINE_BLANK
+
     def create_event(label: str, expiration_dt: datetime) -> ft.Control:
         remaining_days = (expiration_dt.date() - datetime.now().date()).days
         badge_color = None
@@ -51,6 +84,7 @@ def vehicle_view(page: ft.Page, license_plate: str) -> ft.View:
             badge_color = page.theme.color_scheme.tertiary
 
         return ft.ElevatedButton(
+            icon=event_icon(label),
             text=label,
             badge=ft.Badge(
                 _badge_text(remaining_days),
@@ -60,20 +94,21 @@ def vehicle_view(page: ft.Page, license_plate: str) -> ft.View:
             ),
             width=page.width * 0.8,
             height=50,
-            on_click=lambda e: page.go(f"/vehicle/{license_plate}/{label}"),
+            data=label,
+            on_click=open_event,
         )
 
     def load_events() -> None:
         events.controls.clear()
         for e in _get_saved_events():
-            if e.get("vehicle") != license_plate:
+            if e.get("vehicle_id") != vehicle_id:
                 continue
             label = e.get("label")
             expiration_date = datetime.fromisoformat(e.get("expiration_date"))
             events.controls.append(create_event(label, expiration_date))
 
     def update_empty_state() -> None:
-        has = any(e.get("vehicle") == license_plate for e in _get_saved_events())
+        has = len(events.controls) > 0
         no_events_text.visible = not has
         helper_text.visible = has
         page.update()
@@ -125,6 +160,13 @@ def vehicle_view(page: ft.Page, license_plate: str) -> ft.View:
 
     def confirm_add_event(e: ft.ControlEvent | None = None) -> None:
         nonlocal selected_date
+        trace_event(
+            page,
+            "add_event",
+            vehicle=vehicle_id,
+            label=event_dropdown.value,
+            expiration_date=selected_date.isoformat() if selected_date else None,
+        )
         if event_dropdown.value is None:
             event_dropdown.error_text = "Please select\nan event type."
             page.update()
@@ -133,18 +175,14 @@ def vehicle_view(page: ft.Page, license_plate: str) -> ft.View:
         label = event_dropdown.value.strip()
 
         for ev in _get_saved_events():
-            if ev.get("label") == label and ev.get("vehicle") == license_plate:
+            if ev.get("label") == label and ev.get("vehicle_id") == vehicle_id:
                 event_dropdown.error_text = f"{label} already exists\nfor this vehicle."
                 page.update()
                 return
 
         if selected_date is None:
             date_picker.text = "Please select an expiration date."
-            date_picker.bgcolor = page.theme.color_scheme.error
-            date_picker.style = ft.ButtonStyle(
-                color=page.theme.color_scheme.on_error,
-                icon_color=page.theme.color_scheme.on_error,
-            )
+            date_picker.style = styles.error_button()
             page.update()
             return
 
@@ -169,6 +207,163 @@ def vehicle_view(page: ft.Page, license_plate: str) -> ft.View:
         date_picker.style = None
         page.open(add_event_dialog)
 
+    # Selection mode
+    def toggle_selected(evt: ft.ElevatedButton) -> None:
+        selected.symmetric_difference_update({evt.data})
+        evt.icon = event_icon(evt.data)
+        update_selection_bar()
+
+    def update_selection_bar() -> None:
+        if selecting:
+            app_bar.leading = ft.IconButton(ft.Icons.CLOSE, tooltip="Cancel", on_click=toggle_selecting)
+            app_bar.title = ft.Text(f"{len(selected)} selected")
+            app_bar.actions = selection_actions
+            for action in selection_actions[1:]:
+                action.disabled = not selected
+        else:
+            app_bar.leading = ft.IconButton(ft.Icons.ARROW_BACK, on_click=lambda _: page.go("/"))
+            app_bar.title = ft.Text(license_plate)
+            app_bar.actions = [select_button]
+        helper_text.value = "Tap events to select them." if selecting else "Tap an event to view or edit it."
+        add_event_button.visible = not selecting
+
+    def set_selecting(value: bool) -> None:
+        nonlocal selecting
+        selecting = value
+        selected.clear()
+        for evt in events.controls:
+            evt.icon = event_icon(evt.data)
+        update_selection_bar()
+
+    def toggle_selecting(e: ft.ControlEvent) -> None:
+        set_selecting(not selecting)
+        page.update()
+
+    def select_all(e: ft.ControlEvent) -> None:
+        labels = {evt.data for evt in events.controls}
+        if selected >= labels:
+            selected.clear()
+        else:
+            selected.update(labels)
+        for evt in events.controls:
+            evt.icon = event_icon(evt.data)
+        update_selection_bar()
+        page.update()
+
+    # Bulk delete dialog
+    def delete_selected(e: Optional[ft.ControlEvent] = None) -> None:
+        trace_event(page, "delete_events", vehicle=vehicle_id, labels=sorted(selected))
+        bulk.delete_events(page, {(vehicle_id, label) for label in selected})
+        events.controls[:] = [evt for evt in events.controls if evt.data not in selected]
+        set_selecting(False)
+        update_empty_state()
+        page.close(delete_events_dialog)
+
+    delete_events_dialog = ft.AlertDialog(
+        modal=True,
+        title=ft.Text("Delete Events"),
+        content=ft.Text(),
+        actions=[
+            ft.TextButton("Cancel", on_click=lambda _: page.close(delete_events_dialog)),
+            ft.TextButton("Delete", on_click=delete_selected, style=styles.danger_button()),
+        ],
+    )
+
+    def open_delete_events_dialog(e: ft.ControlEvent) -> None:
+        delete_events_dialog.content.value = (
+            f'Are you sure you want to delete {", ".join(sorted(selected))} for "{license_plate}"?'
+        )
+        page.open(delete_events_dialog)
+
+    # Bulk renew dialog
+    renew_months_dropdown = ft.Dropdown(
+        label="Extend by",
+        options=[ft.dropdown.Option(str(m), f"{m} month{'' if m == 1 else 's'}") for m in bulk.RENEW_MONTHS],
+    )
+
+    renew_events_dialog = ft.AlertDialog(
+        modal=True,
+        title=ft.Text("Renew Events"),
+        content=renew_months_dropdown,
+    )
+
+    def confirm_renew_selected(e: Optional[ft.ControlEvent] = None) -> None:
+        months = int(renew_months_dropdown.value)
+        trace_event(page, "renew_events", vehicle=vehicle_id, labels=sorted(selected), months=months)
+        renewed = bulk.renew_events(page, {(vehicle_id, label) for label in selected}, months)
+        set_selecting(False)
+        # Replace only the renewed rows, like a remote change does.
+        for i, evt in enumerate(events.controls):
+            expiration_date = renewed.get((vehicle_id, evt.data))
+            if expiration_date is not None:
+                events.controls[i] = create_event(evt.data, datetime.fromisoformat(expiration_date))
+        page.update()
+        page.close(renew_events_dialog)
+
+    renew_events_dialog.actions = [
+        ft.TextButton("Cancel", on_click=lambda _: page.close(renew_events_dialog)),
+        ft.TextButton("Renew", on_click=confirm_renew_selected),
+    ]
+
+    def open_renew_events_dialog(e: ft.ControlEvent) -> None:
+        renew_months_dropdown.value = str(bulk.RENEW_MONTHS[-1])
+        page.open(renew_events_dialog)
+
+    select_button = ft.IconButton(ft.Icons.CHECKLIST, tooltip="Select", on_click=toggle_selecting)
+    selection_actions = [
+        ft.IconButton(ft.Icons.SELECT_ALL, tooltip="Select all", on_click=select_all),
+        ft.IconButton(ft.Icons.EVENT_REPEAT, tooltip="Renew", on_click=open_renew_events_dialog),
+        ft.IconButton(
+            ft.Icons.DELETE,
+            tooltip="Delete",
+            icon_color=page.theme.color_scheme.error,
+            on_click=open_delete_events_dialog,
+        ),
+    ]
+    app_bar = ft.AppBar(
+        title=ft.Text(license_plate),
+        leading=ft.IconButton(ft.Icons.ARROW_BACK, on_click=lambda _: page.go("/")),
+        actions=[select_button],
+    )
+    add_event_button = ft.FloatingActionButton(icon=ft.Icons.ADD, on_click=open_add_event_dialog)
+
+    # Remote changes
+    def on_remote_change(changes: List[Change]) -> None:
+        nonlocal license_plate
+        prefix = f"{vehicle_id}/"
+        rows = {evt.data: evt for evt in events.controls}
+        changed = False
+        for change in changes:
+            gone = change["deleted"] or change["data"] is None
+            if change["store"] == "vehicles" and change["key"] == vehicle_id:
+                if gone:
+                    for dialog in (add_event_dialog, delete_events_dialog, renew_events_dialog):
+                        if dialog.open:
+                            page.close(dialog)
+                    page.go("/")
+                    return
+                license_plate = change["data"]["plate"]
+                page.title = f"Mașinică - {license_plate}"
+                changed = True
+            elif change["store"] == "events" and change["key"].startswith(prefix):
+                label = change["key"][len(prefix):]
+                row = rows.pop(label, None)
+                if gone:
+                    if row is not None:
+                        events.controls.remove(row)
+                    selected.discard(label)
+                else:
+                    new_row = create_event(label, datetime.fromisoformat(change["data"]["expiration_date"]))
+                    if row is not None:
+                        events.controls[events.controls.index(row)] = new_row
+                    else:
+                        events.controls.append(new_row)
+                    rows[label] = new_row
+                changed = True
+        if changed:
+            update_selection_bar()
+            update_empty_state()
+
     def on_resize(e: ft.ControlEvent) -> None:
         for veh in events.controls:
             try:
@@ -178,12 +373,13 @@ def vehicle_view(page: ft.Page, license_plate: str) -> ft.View:
         page.update()
 
     page.on_resize = on_resize
+    page.session.set(REMOTE_CHANGE_KEY, on_remote_change)
 
     load_events()
     update_empty_state()
 
     return ft.View(
-        f"/vehicle/{license_plate}",
+        f"/vehicle/{vehicle_id}",
         controls=[
             ft.SafeArea(
                 ft.Stack(
@@ -199,13 +395,7 @@ def vehicle_view(page: ft.Page, license_plate: str) -> ft.View:
                 alignment=ft.alignment.bottom_center,
                 padding=ft.padding.only(bottom=60),
             ),
-            ft.AppBar(
-                title=ft.Text(license_plate),
-                leading=ft.IconButton(ft.Icons.ARROW_BACK, on_click=lambda _: page.go("/")),
-            ),
+            app_bar,
         ],
-        floating_action_button=ft.FloatingActionButton(
-            icon=ft.Icons.ADD,
-            on_click=open_add_event_dialog,
-        ),
+        floating_action_button=add_event_button,
     )
\ No newline at end of file
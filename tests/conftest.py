@@ -0,0 +1,17 @@
+from typing import Any, Callable, Dict, Optional
+import pytest
+from sync.versions import SYNC_URL_ENV, SYNC_URL_KEY
+from tracing.replay import FakePage
+
+
+@pytest.fixture
+def make_page(monkeypatch: pytest.MonkeyPatch) -> Callable[..., FakePage]:
+    monkeypatch.delenv(SYNC_URL_ENV, raising=False)
+
+    def make(storage: Optional[Dict[str, Any]] = None, sync: bool = False) -> FakePage:
+        storage = dict(storage or {})
+        if sync:
+            storage[SYNC_URL_KEY] = "http://sync.invalid"
+        return FakePage(storage)
+
+    return make
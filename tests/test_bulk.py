@@ -0,0 +1,142 @@
+from datetime import date
+import pytest
+from storage.bulk import add_months, delete_events, delete_vehicles, renew_events
+from storage.urgency import get_summaries
+from storage.vehicle_registry import get_registry
+from sync.versions import get_tracker
+from tracing.replay import find, replay_renew_events, replay_renew_vehicles, with_text
+
+STORAGE = {
+    "vehicle_registry": {"order": ["v1"], "vehicles": {"v1": {"plate": "B 12 ABC"}}, "index": {"B12ABC": "v1"}},
+    "events": [
+        {"vehicle_id": "v1", "label": "RCA", "expiration_date": "2026-01-01"},
+        {"vehicle_id": "v1", "label": "ITP", "expiration_date": "2026-03-01"},
+    ],
+}
+
+
+@pytest.mark.parametrize("iso, months, expected", [
+    ("2026-01-31", 1, "2026-02-28"),
+    ("2028-01-31", 1, "2028-02-29"),
+    ("2026-11-15", 3, "2027-02-15"),
+    ("2026-12-31", 12, "2027-12-31"),
+    ("2026-05-10T00:00:00", 6, "2026-11-10T00:00:00"),
+])
+def test_add_months_clamps_the_day_and_keeps_the_format(iso, months, expected):
+    assert add_months(iso, months) == expected
+
+
+def test_renew_skips_missing_events(make_page):
+    page = make_page(STORAGE)
+    renewed = renew_events(page, {("v1", "RCA"), ("v1", "ROVINIETA")}, 12)
+    assert renewed == {("v1", "RCA"): "2027-01-01"}
+
+
+def test_vehicle_view_patches_only_the_renewed_rows(make_page):
+    page = make_page(STORAGE)
+    page.go("/vehicle/v1")
+    itp = find(page.views[-1], with_text("ITP"))
+    read = []
+    get = page.client_storage.get
+    page.client_storage.get = lambda key: read.append(key) or get(key)
+
+    replay_renew_events(page, "v1", ["RCA"], 12)
+
+    assert find(page.views[-1], with_text("ITP")) is itp
+    assert find(page.views[-1], with_text("RCA")).badge.text == f"{(date(2027, 1, 1) - date.today()).days} days"
+    assert read.count("events") == 1  # the renew itself, no reload
+    assert {e["label"]: e["expiration_date"] for e in get("events")}["RCA"] == "2027-01-01"
+
+
+FLEET = {
+    "vehicle_registry": {
+        "order": ["v1", "v2", "v3"],
+        "vehicles": {"v1": {"plate": "B 12 ABC"}, "v2": {"plate": "CJ 12 XYZ"}, "v3": {"plate": "IF 07 RAD"}},
+        "index": {"B12ABC": "v1", "CJ12XYZ": "v2", "IF07RAD": "v3"},
+    },
+    "events": [
+        {"vehicle_id": "v1", "label": "RCA", "expiration_date": "2026-01-01"},
+        {"vehicle_id": "v1", "label": "ITP", "expiration_date": "2026-03-01"},
+        {"vehicle_id": "v2", "label": "ITP", "expiration_date": "2026-04-01"},
+        {"vehicle_id": "v3", "label": "RCA", "expiration_date": "2026-05-01"},
+    ],
+}
+
+
+def loaded_page(make_page, sync=False):
+    # Stores and tracker loaded up front, so only the bulk edit is counted.
+    page = make_page(FLEET, sync=sync)
+    get_registry(page)
+    get_summaries(page)  # first run: built from the events and saved
+    tracker = get_tracker(page)
+    if sync:
+        tracker.mark_pushed(tracker.pending())
+    written = []
+    set_ = page.client_storage.set
+    page.client_storage.set = lambda key, value: written.append(key) or set_(key, value)
+    return page, written
+
+
+@pytest.mark.parametrize("sync", [False, True])
+def test_delete_vehicles_cascades_with_one_write_per_key(make_page, sync):
+    page, written = loaded_page(make_page, sync)
+
+    delete_vehicles(page, ["v1", "v3"])
+
+    assert page.client_storage.get("events") == [FLEET["events"][2]]
+    assert page.client_storage.get("urgency_summaries") == {"v2": {"ITP": "2026-04-01"}}
+    registry = page.client_storage.get("vehicle_registry")
+    assert (registry["order"], registry["index"]) == (["v2"], {"CJ12XYZ": "v2"})
+    expected = ["events", "urgency_summaries", "vehicle_registry"] + (["sync_state"] if sync else [])
+    assert sorted(written) == sorted(expected)
+
+
+def test_delete_vehicles_tombstones_vehicles_and_events(make_page):
+    page, _ = loaded_page(make_page, sync=True)
+
+    delete_vehicles(page, ["v1", "v3"])
+
+    pending = get_tracker(page).pending()
+    assert {(c["store"], c["key"]) for c in pending} == {
+        ("vehicles", "v1"), ("vehicles", "v3"), ("events", "v1/RCA"), ("events", "v1/ITP"), ("events", "v3/RCA"),
+    }
+    assert all(c["deleted"] and c["data"] is None for c in pending)
+    assert len({c["version"] for c in pending}) == 1
+
+
+@pytest.mark.parametrize("sync", [False, True])
+def test_delete_events_with_one_write_per_key(make_page, sync):
+    page, written = loaded_page(make_page, sync)
+
+    delete_events(page, [("v1", "RCA"), ("v1", "ITP"), ("v3", "RCA")])
+
+    assert page.client_storage.get("events") == [FLEET["events"][2]]
+    assert page.client_storage.get("urgency_summaries") == {"v1": {}, "v2": {"ITP": "2026-04-01"}, "v3": {}}
+    assert sorted(written) == sorted(["events", "urgency_summaries"] + (["sync_state"] if sync else []))
+    if sync:
+        pending = get_tracker(page).pending()
+        assert {c["key"] for c in pending if c["deleted"]} == {"v1/RCA", "v1/ITP", "v3/RCA"}
+
+
+def test_home_renews_the_vehicles_that_have_the_event(make_page):
+    page = make_page(FLEET)
+    page.go("/")
+
+    replay_renew_vehicles(page, ["B 12 ABC", "CJ 12 XYZ", "IF 07 RAD"], "RCA", 12)
+
+    events = {(e["vehicle_id"], e["label"]): e["expiration_date"] for e in page.client_storage.get("events")}
+    assert events == {("v1", "RCA"): "2027-01-01", ("v1", "ITP"): "2026-03-01",
+                      ("v2", "ITP"): "2026-04-01", ("v3", "RCA"): "2027-05-01"}
+    assert page.client_storage.get("urgency_summaries")["v3"] == {"RCA": "2027-05-01"}
+    assert not page.dialogs
+
+
+def test_home_renew_without_the_event_reports_it(make_page):
+    page = make_page(FLEET)
+    page.go("/")
+
+    replay_renew_vehicles(page, ["CJ 12 XYZ"], "RCA", 12)
+
+    label_dropdown = page.dialogs[-1].content.controls[0]
+    assert label_dropdown.error_text == "None of the selected\nvehicles has RCA."
+    assert page.client_storage.get("events") == FLEET["events"]
@@ -0,0 +1,159 @@
+import pytest
+from sync.versions import OFFLINE_KEY, QUARANTINE_KEY, STATE_KEY, get_tracker
+
+REGISTRY = {"order": ["v1"], "vehicles": {"v1": {"plate": "B 12 ABC"}}, "index": {"B12ABC": "v1"}}
+RCA = {"vehicle_id": "v1", "label": "RCA", "expiration_date": "2026-01-01"}
+
+
+def remote(store: str, key: str, version: int, data=None, deleted: bool = False) -> dict:
+    return {"store": store, "key": key, "version": version, "device": "remote", "deleted": deleted, "data": data}
+
+
+@pytest.mark.parametrize("sync", [False, True])
+def test_bad_event_record_never_wipes_events(make_page, sync):
+    broken = {"vehicle_id": "v1", "label": "ITP"}
+    page = make_page({"vehicle_registry": REGISTRY, "events": [RCA, broken], STATE_KEY: {"broken": True}}, sync=sync)
+
+    get_tracker(page)
+
+    events = page.client_storage.get("events")
+    assert RCA in events
+    if sync:
+        assert page.client_storage.get(QUARANTINE_KEY) == [broken]
+    else:
+        assert events == [RCA, broken]
+
+
+def test_disabled_tracker_reads_and_writes_nothing(make_page):
+    page = make_page({"vehicle_registry": REGISTRY, "events": [RCA]})
+    tracker = get_tracker(page)
+    gets, sets = page.client_storage.gets, page.client_storage.sets
+
+    tracker.touch("events", ["v1/RCA"])
+
+    assert not tracker.enabled
+    assert page.client_storage.sets == sets
+    assert page.client_storage.gets - gets == 1  # was sync used before?
+    assert STATE_KEY not in page.client_storage.data
+
+
+def test_merged_changes_are_not_pushed_back(make_page):
+    page = make_page({"vehicle_registry": REGISTRY, "events": [RCA]}, sync=True)
+    tracker = get_tracker(page)
+    tracker.mark_pushed(tracker.pending())
+    assert tracker.pending() == []
+
+    merged = tracker.merge([
+        remote("events", "v1/ITP", 10, {"vehicle_id": "v1", "label": "ITP", "expiration_date": "2027-01-01"}),
+    ])
+
+    assert [c["key"] for c in merged] == ["v1/ITP"]
+    assert tracker.pending() == []
+    tracker.touch("events", ["v1/RCA"])
+    assert [(c["key"], c["version"]) for c in tracker.pending()] == [("v1/RCA", 11)]
+
+
+def test_edit_during_push_stays_pending(make_page):
+    page = make_page({"vehicle_registry": REGISTRY, "events": [RCA]}, sync=True)
+    tracker = get_tracker(page)
+    batch = tracker.pending()
+    tracker.touch("events", ["v1/RCA"])
+
+    tracker.mark_pushed(batch)
+
+    assert [c["key"] for c in tracker.pending()] == ["v1/RCA"]
+
+
+def test_pushed_tombstones_are_dropped(make_page):
+    page = make_page({"vehicle_registry": REGISTRY, "events": [RCA]}, sync=True)
+    tracker = get_tracker(page)
+    page.client_storage.set("events", [])
+    tracker.touch("events", ["v1/RCA"], deleted=True)
+
+    tracker.mark_pushed(tracker.pending())
+
+    assert "v1/RCA" not in tracker.state["versions"]["events"]
+    assert tracker.pending() == []
+
+
+def test_offline_edits_are_pushed_when_sync_is_back(make_page):
+    page = make_page({"vehicle_registry": REGISTRY, "events": [RCA]}, sync=True)
+    tracker = get_tracker(page)
+    tracker.mark_pushed(tracker.pending())
+    storage = {key: page.client_storage.get(key) for key in ("vehicle_registry", "events", STATE_KEY)}
+
+    offline = make_page(storage)
+    get_tracker(offline).touch("events", ["v1/RCA"], deleted=True)
+    assert offline.client_storage.get(OFFLINE_KEY) == {"events": {"v1/RCA": True}}
+
+    online = make_page({key: offline.client_storage.get(key) for key in (*storage, OFFLINE_KEY)}, sync=True)
+    pending = get_tracker(online).pending()
+
+    assert [(c["key"], c["deleted"]) for c in pending] == [("v1/RCA", True)]
+    assert OFFLINE_KEY not in online.client_storage.data
+
+
+def test_state_saved_with_pushed_watermark_is_upgraded(make_page):
+    state = {
+        "device": "d",
+        "clock": 3,
+        "pushed": 2,
+        "watermark": 0,
+        "epoch": None,
+        "versions": {"vehicles": {"v1": [1, "d", False]}, "events": {"v1/RCA": [3, "d", False]}},
+    }
+    page = make_page({"vehicle_registry": REGISTRY, "events": [RCA], STATE_KEY: state}, sync=True)
+
+    assert [c["key"] for c in get_tracker(page).pending()] == ["v1/RCA"]
+
+
+def test_same_plate_added_on_two_devices_is_folded(make_page):
+    local = {"order": ["v2"], "vehicles": {"v2": {"plate": "CJ 12 XYZ"}}, "index": {"CJ12XYZ": "v2"}}
+    page = make_page({
+        "vehicle_registry": local,
+        "events": [
+            {"vehicle_id": "v2", "label": "RCA", "expiration_date": "2027-01-01"},
+            {"vehicle_id": "v2", "label": "ITP", "expiration_date": "2026-05-01"},
+        ],
+    }, sync=True)
+    tracker = get_tracker(page)
+    tracker.mark_pushed(tracker.pending())
+
+    merged = tracker.merge([
+        remote("vehicles", "v1", 5, {"plate": "CJ 12 XYZ"}),
+        remote("events", "v1/RCA", 6, {"vehicle_id": "v1", "label": "RCA", "expiration_date": "2026-01-01"}),
+    ])
+
+    registry = page.client_storage.get("vehicle_registry")
+    assert registry["order"] == ["v1"]
+    assert registry["index"] == {"CJ12XYZ": "v1"}
+    events = {(e["vehicle_id"], e["label"]): e["expiration_date"] for e in page.client_storage.get("events")}
+    assert events == {("v1", "RCA"): "2027-01-01", ("v1", "ITP"): "2026-05-01"}
+    assert page.client_storage.get("urgency_summaries") == {"v1": {"RCA": "2027-01-01", "ITP": "2026-05-01"}}
+    pending = {(c["store"], c["key"], c["deleted"]) for c in tracker.pending()}
+    assert pending == {
+        ("vehicles", "v2", True),
+        ("events", "v2/RCA", True),
+        ("events", "v2/ITP", True),
+        ("events", "v1/RCA", False),
+        ("events", "v1/ITP", False),
+    }
+    assert ("vehicles", "v2", True) in {(c["store"], c["key"], c["deleted"]) for c in merged}
+
+
+def test_malformed_changes_are_skipped_before_versions_move(make_page):
+    page = make_page({"vehicle_registry": REGISTRY, "events": [RCA]}, sync=True)
+    tracker = get_tracker(page)
+    before = {store: dict(table) for store, table in tracker.state["versions"].items()}
+
+    merged = tracker.merge([
+        remote("events", "v1/ITP", 10, data="not a record"),
+        remote("events", "v1/ITP", 11, {"vehicle_id": "v1", "label": "ITP"}),
+        remote("events", "v1/CASCO", 12, {"vehicle_id": "v2", "label": "CASCO", "expiration_date": "2027-01-01"}),
+        remote("vehicles", "v2", 13, {"plate": 42}),
+        {"store": "events", "key": "v1/RCA"},
+    ])
+
+    assert merged == []
+    assert tracker.state["versions"] == before
+    assert page.client_storage.get("events") == [RCA]
@@ -0,0 +1,154 @@
+import threading
+from datetime import date, timedelta
+import pytest
+from storage.session import session_lock
+from storage.vehicle_registry import get_registry
+from sync.versions import ChangeTracker, get_tracker
+from tracing.replay import walk
+
+STORAGE = {
+    "vehicle_registry": {"order": ["v1"], "vehicles": {"v1": {"plate": "B 12 ABC"}}, "index": {"B12ABC": "v1"}},
+    "events": [{"vehicle_id": "v1", "label": "RCA", "expiration_date": "2026-01-01"}],
+}
+
+
+@pytest.mark.parametrize("sync", [False, True])
+def test_warm_start_reads_only_the_snapshot_registry_and_summaries(make_page, sync):
+    first = make_page(STORAGE)
+    first.go("/")  # a cold start writes the home snapshot
+
+    page = make_page(sync=sync)
+    page.client_storage.data.update(first.client_storage.data)
+    read = []
+    get = page.client_storage.get
+    page.client_storage.get = lambda key: read.append(key) or get(key)
+
+    page.go("/")
+
+    assert read == ["home_snapshot", "vehicle_registry", "urgency_summaries"]
+
+
+def warm_page(make_page, **kwargs):
+    first = make_page(STORAGE)
+    first.go("/")
+    page = make_page(**kwargs)
+    page.client_storage.data.update(first.client_storage.data)
+    return page
+
+
+def test_warm_start_when_the_registry_is_already_loaded(make_page):
+    page = warm_page(make_page, sync=True)
+    get_registry(page)  # as the sync thread or the trace recorder would
+    read = []
+    get = page.client_storage.get
+    page.client_storage.get = lambda key: read.append(key) or get(key)
+
+    page.go("/")
+
+    assert read == ["home_snapshot", "urgency_summaries"]
+
+
+def test_only_the_first_view_paints_from_the_snapshot(make_page):
+    page = warm_page(make_page)
+    page.go("/vehicle/v1")
+    read = []
+    get = page.client_storage.get
+    page.client_storage.get = lambda key: read.append(key) or get(key)
+
+    page.go("/")
+
+    assert "home_snapshot" not in read
+
+
+def test_loading_the_tracker_does_not_hold_the_store_lock(make_page, monkeypatch):
+    page = warm_page(make_page, sync=True)
+    loading, release = threading.Event(), threading.Event()
+
+    def slow_offline(tracker):
+        loading.set()
+        release.wait(5)
+        return False
+
+    monkeypatch.setattr(ChangeTracker, "_apply_offline", slow_offline)
+    thread = threading.Thread(target=get_tracker, args=(page,))
+    thread.start()
+    try:
+        assert loading.wait(5)
+        lock = session_lock(page)
+        assert lock.acquire(timeout=1)
+        lock.release()
+    finally:
+        release.set()
+        thread.join()
+
+
+FLEET = {
+    "vehicle_registry": {
+        "order": ["v1", "v2", "v3"],
+        "vehicles": {"v1": {"plate": "B 12 ABC"}, "v2": {"plate": "CJ 12 XYZ"}, "v3": {"plate": "IF 07 RAD"}},
+        "index": {"B12ABC": "v1", "CJ12XYZ": "v2", "IF07RAD": "v3"},
+    },
+    "events": [
+        {"vehicle_id": "v2", "label": "RCA", "expiration_date": "2099-01-01"},
+        {"vehicle_id": "v3", "label": "RCA", "expiration_date": "2099-01-01"},
+    ],
+}
+
+
+def snapshot_page(make_page, changes=None):
+    # A page whose home snapshot was written before `changes` hit the stores;
+    # revalidation is held back until the test runs it.
+    first = make_page(FLEET)
+    first.go("/")
+    page = make_page()
+    page.client_storage.data.update(first.client_storage.data)
+    for key, value in (changes or {}).items():
+        page.client_storage.set(key, value)
+    revalidations = []
+    page.run_thread = lambda handler, *args: revalidations.append((handler, args))
+    page.go("/")
+    return page, revalidations
+
+
+def rows(page):
+    return {c.data["id"]: c for c in walk(page.views[-1]) if isinstance(getattr(c, "data", None), dict)}
+
+
+def test_revalidate_patches_a_stale_snapshot(make_page):
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+    page, revalidations = snapshot_page(make_page, {
+        "vehicle_registry": {
+            "order": ["v1", "v3", "v4"],
+            "vehicles": {"v1": {"plate": "B 99 ABC"}, "v3": {"plate": "IF 07 RAD"}, "v4": {"plate": "AB 01 CDE"}},
+            "index": {"B99ABC": "v1", "IF07RAD": "v3", "AB01CDE": "v4"},
+        },
+        "urgency_summaries": {"v3": {"RCA": yesterday}},
+    })
+    stale = rows(page)
+    assert [stale[i].text for i in ("v1", "v2", "v3")] == ["B 12 ABC", "CJ 12 XYZ", "IF 07 RAD"]
+
+    handler, args = revalidations.pop()
+    handler(*args)
+
+    fresh = rows(page)
+    assert list(fresh) == ["v1", "v3", "v4"]
+    assert fresh["v1"] is stale["v1"] and fresh["v1"].text == "B 99 ABC"
+    assert fresh["v3"] is stale["v3"] and fresh["v3"].badge.text.startswith("1 expired")
+    assert [row["id"] for row in page.client_storage.get("home_snapshot")] == ["v1", "v3", "v4"]
+
+
+def test_revalidate_leaves_a_current_snapshot_alone(make_page):
+    page, revalidations = snapshot_page(make_page)
+    stale = rows(page)
+    badges = {vehicle_id: veh.badge for vehicle_id, veh in stale.items()}
+    written = []
+    set_ = page.client_storage.set
+    page.client_storage.set = lambda key, value: written.append(key) or set_(key, value)
+
+    handler, args = revalidations.pop()
+    handler(*args)
+
+    fresh = rows(page)
+    assert list(fresh) == list(stale)
+    assert all(fresh[i] is stale[i] and fresh[i].badge is badges[i] for i in fresh)
+    assert written == []
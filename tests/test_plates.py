@@ -0,0 +1,37 @@
+import pytest
+from storage.plates import canonical_key, normalize_plate
+
+
+@pytest.mark.parametrize("plate", ["B 123 ABC", "B123ABC", "b-123-abc", " b.123 abc ", "B_123·ABC"])
+def test_separators_and_case_share_a_key(plate):
+    assert canonical_key(plate) == "B123ABC"
+
+
+@pytest.mark.parametrize("plate, expected", [
+    ("cj12xyz", "CJ 12 XYZ"),
+    ("B 12 ABC", "B 12 ABC"),
+    ("B123ABC", "B 123 ABC"),
+    ("IF-07-RAD", "IF 07 RAD"),
+    ("B 012345", "B 012345"),
+    ("CJ 123", "CJ 123"),
+])
+def test_valid_plates_are_normalized(plate, expected):
+    assert normalize_plate(plate) == expected
+
+
+@pytest.mark.parametrize("plate", [
+    "",
+    "FOREIGN1",
+    "XX 12 ABC",   # unknown county
+    "CJ 123 ABC",  # three digits only exist in Bucharest
+    "B 1234 ABC",
+    "B 00 ABC",    # all-zero number
+    "CJ 12 IAB",   # letters may not start with I or O
+    "CJ 12 OAB",
+    "CJ 12 AQB",   # Q is never used
+    "CJ 12 AB",
+    "CJ 12",       # temporary plates need 3 to 6 digits
+    "B 1234567",
+])
+def test_invalid_plates_are_rejected(plate):
+    assert normalize_plate(plate) is None
@@ -0,0 +1,44 @@
+from sync.protocol import chunk, decode_batch, encode_batch, valid_change, wins
+
+
+def change(version: int, device: str) -> dict:
+    return {"store": "vehicles", "key": "v1", "version": version, "device": device, "deleted": False, "data": None}
+
+
+def test_wins_against_missing_record():
+    assert wins(change(1, "a"), None)
+
+
+def test_higher_version_wins():
+    assert wins(change(3, "a"), change(2, "z"))
+    assert not wins(change(2, "z"), change(3, "a"))
+
+
+def test_version_tie_goes_to_higher_device():
+    assert wins(change(2, "b"), change(2, "a"))
+    assert not wins(change(2, "a"), change(2, "b"))
+
+
+def test_same_change_does_not_win_again():
+    assert not wins(change(2, "a"), change(2, "a"))
+
+
+def test_batch_round_trip():
+    payload = {"device": "a", "since": 3, "changes": [change(1, "a")]}
+    assert decode_batch(encode_batch(payload)) == payload
+
+
+def test_chunk_always_yields_a_batch():
+    assert chunk([]) == [[]]
+    assert [len(batch) for batch in chunk(list(range(5)), size=2)] == [2, 2, 1]
+
+
+def test_valid_change_checks_data_against_its_key():
+    live = {"store": "events", "key": "v/RCA", "version": 1, "device": "a", "deleted": False,
+            "data": {"vehicle_id": "v", "label": "RCA", "expiration_date": "2026-01-01"}}
+    assert valid_change(live)
+    assert valid_change({**live, "deleted": True, "data": None})
+    assert not valid_change({**live, "key": "w/RCA"})
+    assert not valid_change({**live, "data": ["v", "RCA"]})
+    assert not valid_change({**live, "version": "1"})
+    assert not valid_change({**live, "store": "plates"})
@@ -0,0 +1,28 @@
+from tracing.replay import replay
+
+
+def test_vehicle_added_during_the_session_is_mapped():
+    results = replay({"storage": {}}, [
+        (0, "route", {"route": "/"}),
+        (1, "add_vehicle", {"plate": "B 12 ABC", "id": "recorded"}),
+        (2, "route", {"route": "/vehicle/recorded"}),
+        (3, "add_event", {"vehicle": "recorded", "label": "RCA", "expiration_date": "2027-01-01"}),
+        (4, "route", {"route": "/vehicle/recorded/RCA"}),
+    ])
+
+    assert [r["error"] for r in results] == [None] * 5
+    assert results[-1]["args"]["route"] != "/vehicle/recorded/RCA"
+
+
+def test_unrecorded_redirect_is_an_error():
+    results = replay({"storage": {}}, [(0, "route", {"route": "/"}), (1, "route", {"route": "/vehicle/unknown"})])
+    assert results[-1]["error"] == "Redirected from /vehicle/unknown to /"
+
+
+def test_recorded_redirect_is_not_replayed_twice():
+    results = replay({"storage": {}}, [
+        (0, "route", {"route": "/"}),
+        (1, "route", {"route": "/vehicle/unknown"}),
+        (2, "route", {"route": "/"}),
+    ])
+    assert [(r["kind"], r["error"]) for r in results] == [("route", None), ("route", None)]
@@ -0,0 +1,15 @@
+from storage.session import session_lock
+
+
+def test_each_session_has_its_own_lock(make_page):
+    first, second = make_page(), make_page()
+
+    assert session_lock(first) is session_lock(first)
+    assert session_lock(first) is not session_lock(second)
+
+
+def test_lock_is_reentrant_within_a_session(make_page):
+    page = make_page()
+    with session_lock(page):
+        assert session_lock(page).acquire(blocking=False)
+        session_lock(page).release()
@@ -0,0 +1,70 @@
+import io
+import urllib.request
+from typing import List
+import pytest
+from storage.bulk import delete_vehicles
+from sync.client import SyncClient
+from sync.protocol import Change, decode_batch, encode_batch
+from sync.server import SyncStore
+from sync.versions import get_tracker
+from tracing.replay import replay_add_event
+
+
+
+def test_sync_loop_survives_any_error(make_page):
+    calls = []
+
+    class FlakyClient(SyncClient):
+        def sync_once(self) -> List[Change]:
+            calls.append(len(calls))
+            if len(calls) == 1:
+                raise TypeError("'str' object is not a mapping")
+            self.stop()
+            return []
+
+    client = FlakyClient(get_tracker(make_page(sync=True)), "http://sync.invalid", lambda changes: None, interval=0.01)
+    client._run()
+
+    assert calls == [0, 1]
+
+
+@pytest.mark.parametrize("body", [[], {"seq": "1", "changes": []}, {"seq": 1, "changes": {}}, {"seq": 1, "changes": [], "epoch": 3}])
+def test_malformed_response_is_rejected(make_page, monkeypatch, body):
+    monkeypatch.setattr(urllib.request, "urlopen", lambda request, timeout: io.BytesIO(encode_batch(body)))
+    client = SyncClient(get_tracker(make_page(sync=True)), "http://sync.invalid", lambda changes: None)
+
+    with pytest.raises(ValueError):
+        client.sync_once()
+
+
+def connect(page, store: SyncStore) -> SyncClient:
+    client = SyncClient(get_tracker(page), "http://sync.invalid", lambda changes: None)
+    # Through the wire format, so the devices never share objects.
+    client._post = lambda payload: decode_batch(encode_batch(store.exchange(decode_batch(encode_batch(payload)))))
+    return client
+
+
+def test_event_added_to_a_vehicle_deleted_elsewhere_is_dropped_everywhere(make_page):
+    store = SyncStore()
+    a = make_page({
+        "vehicle_registry": {"order": ["v1"], "vehicles": {"v1": {"plate": "B 12 ABC"}}, "index": {"B12ABC": "v1"}},
+        "events": [{"vehicle_id": "v1", "label": "RCA", "expiration_date": "2026-01-01"}],
+    }, sync=True)
+    b = make_page(sync=True)
+    clients = [connect(a, store), connect(b, store)]
+    for client in clients:
+        client.sync_once()
+
+    b.go("/vehicle/v1")
+    replay_add_event(b, "v1", "ITP", "2027-01-01")
+    clients[1].sync_once()
+    delete_vehicles(a, ["v1"])  # before A saw the ITP
+    for _ in range(3):
+        for client in clients:
+            client.sync_once()
+
+    for page in (a, b):
+        assert page.client_storage.get("events") == []
+        assert page.client_storage.get("urgency_summaries") == {}
+        assert page.client_storage.get("vehicle_registry")["order"] == []
+        assert get_tracker(page).pending() == []
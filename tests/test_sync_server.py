@@ -0,0 +1,75 @@
+import pytest
+from sync import server
+from sync.server import SyncStore
+
+
+def change(key: str, version: int, device: str = "a", deleted: bool = False) -> dict:
+    return {
+        "store": "events",
+        "key": key,
+        "version": version,
+        "device": device,
+        "deleted": deleted,
+        "data": None if deleted else {"vehicle_id": "v", "label": key, "expiration_date": "2026-01-01"},
+    }
+
+
+def test_push_is_not_echoed_back():
+    store = SyncStore()
+    response = store.exchange({"since": 0, "changes": [change("RCA", 1)]})
+    assert response["changes"] == []
+    assert response["seq"] == 1
+    assert not response["more"]
+
+
+def test_pull_returns_only_changes_since_watermark():
+    store = SyncStore()
+    store.exchange({"since": 0, "changes": [change("RCA", 1), change("ITP", 2)]})
+    store.exchange({"since": 2, "changes": [change("RCA", 3)]})
+
+    response = store.exchange({"since": 2, "changes": []})
+    assert [c["key"] for c in response["changes"]] == ["RCA"]
+    assert response["seq"] == 3
+
+
+def test_losing_change_is_rejected():
+    store = SyncStore()
+    store.exchange({"since": 0, "changes": [change("RCA", 5, device="b")]})
+    response = store.exchange({"since": 0, "changes": [change("RCA", 4)]})
+    assert [(c["version"], c["device"]) for c in response["changes"]] == [(5, "b")]
+    assert store.seq == 1
+
+
+def test_pull_pages_with_more(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(server, "BATCH_SIZE", 2)
+    store = SyncStore()
+    store.exchange({"since": 0, "changes": [change(f"E{i}", i + 1) for i in range(5)]})
+
+    since, pages = 0, []
+    while True:
+        response = store.exchange({"since": since, "changes": []})
+        pages.append([c["key"] for c in response["changes"]])
+        since = response["seq"]
+        if not response["more"]:
+            break
+
+    assert pages == [["E0", "E1"], ["E2", "E3"], ["E4"]]
+    assert since == store.seq
+
+
+def test_watermark_from_another_epoch_restarts_the_pull():
+    store = SyncStore()
+    store.exchange({"since": 0, "changes": [change("RCA", 1)]})
+    response = store.exchange({"since": 99, "changes": []})
+    assert [c["key"] for c in response["changes"]] == ["RCA"]
+
+
+def test_store_persists_log_and_epoch(tmp_path):
+    path = str(tmp_path / "sync.json")
+    store = SyncStore(path)
+    store.exchange({"since": 0, "changes": [change("RCA", 1), change("ITP", 2, deleted=True)]})
+
+    reloaded = SyncStore(path)
+    assert reloaded.epoch == store.epoch
+    assert reloaded.seq == 2
+    assert reloaded.exchange({"since": 0, "changes": []})["changes"] == list(store.log.values())
@@ -0,0 +1,21 @@
+import flet as ft
+from themes.catppuccin_theme import catppuccin_theme, theme_styles
+
+
+def test_each_button_gets_its_own_style():
+    styles = theme_styles(catppuccin_theme("dark"))
+    first = ft.ElevatedButton("Pick a date", style=styles.error_button(), color="white")
+    first.before_update()
+
+    second = styles.error_button()
+
+    assert second is not first.style
+    assert second.color == styles.colors.on_error
+    assert theme_styles(catppuccin_theme("dark")) is styles
+
+
+def test_styles_are_cached_per_theme_mode_only():
+    assert theme_styles(catppuccin_theme("light")) is not theme_styles(catppuccin_theme("dark"))
+    other = ft.Theme(color_scheme=ft.ColorScheme(on_background="#123456"))
+    assert theme_styles(other).helper_text.color == "#123456"
+    assert theme_styles(other) is not theme_styles(other)
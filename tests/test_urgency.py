@@ -0,0 +1,93 @@
+from datetime import date, timedelta
+import pytest
+from storage.urgency import SUMMARY_KEY, Urgency, UrgencySummaries, get_summaries
+from sync.versions import get_tracker
+from tracing.replay import (
+    replay_add_event,
+    replay_delete_event,
+    replay_delete_vehicle,
+    replay_save_event,
+)
+
+TODAY = date(2026, 6, 1)
+STORAGE = {
+    "vehicle_registry": {
+        "order": ["v1", "v2"],
+        "vehicles": {"v1": {"plate": "B 12 ABC"}, "v2": {"plate": "CJ 12 XYZ"}},
+        "index": {"B12ABC": "v1", "CJ12XYZ": "v2"},
+    },
+    "events": [
+        {"vehicle_id": "v1", "label": "RCA", "expiration_date": "2099-01-01"},
+        {"vehicle_id": "v2", "label": "ITP", "expiration_date": "2099-03-01"},
+    ],
+}
+
+
+def days(n: int) -> str:
+    return (TODAY + timedelta(days=n)).isoformat()
+
+
+@pytest.mark.parametrize("dates, expected", [
+    ({}, Urgency(0, 0, None, None)),
+    ({"RCA": days(-1), "ITP": days(-30)}, Urgency(2, 0, None, None)),
+    ({"RCA": days(0), "ITP": days(15), "CASCO": days(16)}, Urgency(0, 2, "RCA", TODAY)),
+    ({"RCA": days(-1), "ITP": days(40), "CASCO": f"{days(20)}T00:00:00"}, Urgency(1, 0, "CASCO", TODAY + timedelta(days=20))),
+])
+def test_urgency_counts_expired_soon_and_nearest(dates, expected):
+    assert UrgencySummaries({"v1": dates}).urgency("v1", TODAY) == expected
+
+
+def test_from_events_skips_unusable_records():
+    summaries = UrgencySummaries.from_events([
+        {"vehicle_id": "v1", "label": "RCA", "expiration_date": "2026-01-01"},
+        {"vehicle_id": "v1", "label": "ITP"},
+        "not an event",
+    ])
+    assert summaries.data == {"v1": {"RCA": "2026-01-01"}}
+
+
+def stored(page) -> dict:
+    # The saved summaries, which must always match the events they summarize.
+    data = {vehicle_id: dates for vehicle_id, dates in page.client_storage.get(SUMMARY_KEY).items() if dates}
+    assert data == UrgencySummaries.from_events(page.client_storage.get("events")).data
+    return data
+
+
+def test_summaries_follow_event_edits(make_page):
+    page = make_page(STORAGE)
+    page.go("/vehicle/v1")
+
+    replay_add_event(page, "v1", "ITP", "2027-02-01")
+    assert stored(page)["v1"] == {"RCA": "2099-01-01", "ITP": "2027-02-01T00:00:00"}
+
+    page.go("/vehicle/v1/ITP")
+    replay_save_event(page, "v1", "ITP", "2027-03-01")
+    assert stored(page)["v1"]["ITP"].startswith("2027-03-01")
+
+    page.go("/vehicle/v1/RCA")
+    replay_delete_event(page, "v1", "RCA")
+    assert list(stored(page)["v1"]) == ["ITP"]
+
+
+def test_summaries_drop_a_deleted_vehicle(make_page):
+    page = make_page(STORAGE)
+    page.go("/")
+
+    replay_delete_vehicle(page, "CJ 12 XYZ")
+
+    assert stored(page) == {"v1": {"RCA": "2099-01-01"}}
+    assert get_summaries(page).urgency("v2", TODAY) == Urgency(0, 0, None, None)
+
+
+def test_summaries_follow_a_sync_merge(make_page):
+    page = make_page(STORAGE, sync=True)
+    tracker = get_tracker(page)
+
+    tracker.merge([
+        {"store": "events", "key": "v1/RCA", "version": 10, "device": "remote", "deleted": False,
+         "data": {"vehicle_id": "v1", "label": "RCA", "expiration_date": "2026-06-05"}},
+        {"store": "events", "key": "v2/ITP", "version": 11, "device": "remote", "deleted": True, "data": None},
+    ])
+
+    assert stored(page) == {"v1": {"RCA": "2026-06-05"}}
+    assert get_summaries(page).urgency("v1", TODAY) == Urgency(0, 1, "RCA", date(2026, 6, 5))
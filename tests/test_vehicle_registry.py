@@ -0,0 +1,51 @@
+from storage.vehicle_registry import LEGACY_VEHICLES_KEY, REGISTRY_KEY, VehicleRegistry, get_registry
+
+
+def test_legacy_plates_collapse_into_one_vehicle(make_page):
+    page = make_page({
+        LEGACY_VEHICLES_KEY: ["cj-12-xyz", "CJ 12 XYZ", "B 12 ABC"],
+        "events": [
+            {"vehicle": "cj-12-xyz", "label": "RCA", "expiration_date": "2026-01-01"},
+            {"vehicle": "CJ 12 XYZ", "label": "RCA", "expiration_date": "2026-06-01"},
+            {"vehicle": "CJ 12 XYZ", "label": "ITP", "expiration_date": "2026-03-01"},
+            {"vehicle": "gone", "label": "RCA", "expiration_date": "2026-03-01"},
+        ],
+        "sync_state": {"versions": "keyed by plate"},
+    })
+
+    registry = get_registry(page)
+
+    assert [registry.plate(vehicle_id) for vehicle_id in registry.order] == ["CJ 12 XYZ", "B 12 ABC"]
+    cj = registry.find("CJ12XYZ")
+    events = {(e["vehicle_id"], e["label"]): e["expiration_date"] for e in page.client_storage.get("events")}
+    assert events == {(cj, "RCA"): "2026-06-01", (cj, "ITP"): "2026-03-01"}
+    assert LEGACY_VEHICLES_KEY not in page.client_storage.data
+    assert "sync_state" not in page.client_storage.data
+    assert VehicleRegistry.is_valid(page.client_storage.get(REGISTRY_KEY))
+
+
+def test_legacy_plate_that_does_not_validate_is_kept(make_page):
+    page = make_page({LEGACY_VEHICLES_KEY: ["foreign1"], "events": []})
+    registry = get_registry(page)
+    assert registry.plate(registry.find("FOREIGN1")) == "FOREIGN1"
+
+
+def test_put_with_a_taken_plate_returns_the_loser():
+    registry = VehicleRegistry()
+    registry.add("CJ 12 XYZ", "b")
+
+    assert registry.put("a", "cj12xyz") == "b"
+    assert registry.find("CJ 12 XYZ") == "a"
+    assert registry.put("c", "CJ 12 XYZ") == "c"
+    assert registry.find("CJ 12 XYZ") == "a"
+
+
+def test_remove_many_keeps_order_and_index():
+    registry = VehicleRegistry()
+    for vehicle_id, plate in (("a", "B 12 ABC"), ("b", "CJ 12 XYZ"), ("c", "IF 07 RAD")):
+        registry.add(plate, vehicle_id)
+
+    registry.remove_many({"a", "c", "missing"})
+
+    assert registry.order == ["b"]
+    assert registry.index == {"CJ12XYZ": "b"}